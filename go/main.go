@@ -1,7 +1,10 @@
 package main
 
 import (
+	"bufio"
+	"encoding/json"
 	"flag"
+	"io"
 	"io/ioutil"
 	"log"
 	"os"
@@ -23,6 +26,33 @@ func makePath(dirPath string, id string) string {
 	return path.Join(dirPath, id) + ".html"
 }
 
+// StreamRecord is a rendered entry as written by -stream, one JSON object per line.
+type StreamRecord struct {
+	Oldid string `json:"oldid"`
+	Title string `json:"title"`
+	HTML  string `json:"html"`
+}
+
+// writeStream writes entries as NDJSON records; a write blocks while the reader is behind,
+// which holds back the renderer in turn.
+func writeStream(entries <-chan RenderedEntry, w io.Writer) error {
+	bw := bufio.NewWriter(w)
+	encoder := json.NewEncoder(bw)
+	encoder.SetEscapeHTML(false)
+	for entry := range entries {
+		err := encoder.Encode(StreamRecord{Oldid: entry.id, Title: entry.title, HTML: entry.text})
+		if err != nil {
+			return err
+		}
+		// hand every record over right away
+		err = bw.Flush()
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
 func main() {
 	var dump string
 	flag.StringVar(&dump, "dump", "", "path to Wiktionary dump")
@@ -39,6 +69,9 @@ func main() {
 	var outDir string
 	flag.StringVar(&outDir, "out", "out", "output directory")
 
+	var stream bool
+	flag.BoolVar(&stream, "stream", false, "write entries to stdout as NDJSON records (oldid, title, html) instead of files")
+
 	flag.Parse()
 
 	lang := getLang(langStr)
@@ -46,6 +79,17 @@ func main() {
 		log.Fatal("Unknown language: " + langStr)
 	}
 
+	renderer := EntryRenderer{urls: urls, workerNum: workerNum}
+	if stream {
+		// nothing on disk to skip
+		err := writeStream(renderer.renderEntries(readDump(dump, lang)), os.Stdout)
+		if err != nil {
+			log.Fatal(err)
+		}
+		log.Println("Done.")
+		return
+	}
+
 	err := os.MkdirAll(outDir, 0755)
 	if err != nil {
 		log.Fatal(err)
@@ -67,7 +111,6 @@ func main() {
 		close(newLangEntries)
 	}()
 
-	renderer := EntryRenderer{urls: urls, workerNum: workerNum}
 	for entry := range renderer.renderEntries(newLangEntries) {
 		p := makePath(outDir, entry.id)
 		log.Printf("Writing to %s\n", p)
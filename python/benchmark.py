@@ -0,0 +1,152 @@
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from wiktionary_extractor.dispatch import Dispatcher
+from wiktionary_extractor.entry import Entry, to_json_default
+from wiktionary_extractor.extractor import get_stages, remove_duplicates
+from wiktionary_extractor.test_util import get_test_data_dir_path, list_test_data
+from wiktionary_extractor.util import get_backend, get_extractors, get_pruned_classes
+from wiktionary_extractor.writer import reformat
+
+STAGES = ['parse', 'clean', 'sections', 'extract', 'serialize']
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_language(lang, replicas):
+    backend = get_backend(lang)
+    dispatcher = Dispatcher(get_extractors(lang), backend, pruned_classes=get_pruned_classes(lang))
+    parse, clean, index_sections = get_stages(backend)
+
+    pages = []
+    for html_path in sorted(list_test_data(lang)):
+        with open(html_path, 'rb') as f:
+            pages.append(f.read())
+
+    stages = defaultdict(float)
+    extractors = defaultdict(float)
+    entry_num = 0
+    # failed extractor calls, which would otherwise show up as time saved
+    error_num = 0
+    start = time.perf_counter()
+    for replica in range(replicas):
+        for data in pages:
+            t0 = time.perf_counter()
+            root = parse(data, dispatcher.pruner)
+            t1 = time.perf_counter()
+            clean(root)
+            t2 = time.perf_counter()
+            sections = index_sections(root)
+            t3 = time.perf_counter()
+            stages['parse'] += t1 - t0
+            stages['clean'] += t2 - t1
+            stages['sections'] += t3 - t2
+
+            objs = []
+            for section in sections:
+                for pos, extractor in dispatcher.lookup(section.headline):
+                    t0 = time.perf_counter()
+                    try:
+                        obj = extractor(section)
+                    except Exception as ex:
+                        if replica == 0:
+                            print('Error: {}\t{}: {!r}'.format(lang, section.headline, ex), file=sys.stderr)
+                        error_num += 1
+                        obj = None
+                    if obj:
+                        form, attrs, variants, definitions = obj
+                        objs.append(Entry(form, pos, attrs, remove_duplicates(variants), definitions))
+                    extractors[pos] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for obj in objs:
+                json.dumps(reformat(obj), default=to_json_default)
+            stages['serialize'] += time.perf_counter() - t0
+            entry_num += len(objs)
+    seconds = time.perf_counter() - start
+    stages['extract'] = sum(extractors.values())
+
+    page_num = len(pages) * replicas
+    return {
+        'backend': backend,
+        'pages': page_num,
+        'entries': entry_num,
+        'errors': error_num,
+        'seconds': seconds,
+        'pages_per_sec': page_num / seconds,
+        'entries_per_sec': entry_num / seconds,
+        'stages': {stage: stages[stage] for stage in STAGES},
+        'extractors': dict(extractors),
+    }
+
+
+def compare(old, new):
+    print('{:<8} {:<12} {:>10} {:>10} {:>8}'.format('lang', 'stage', 'old', 'new', 'ratio'))
+    for lang, result in sorted(new['languages'].items()):
+        if lang not in old['languages']:
+            continue
+        old_result = old['languages'][lang]
+        rows = [('total', old_result['seconds'] / old_result['pages'], result['seconds'] / result['pages'])]
+        for stage in STAGES:
+            rows.append((stage, old_result['stages'][stage] / old_result['pages'],
+                         result['stages'][stage] / result['pages']))
+        for stage, old_time, new_time in rows:
+            # seconds per page, so that runs with different replica counts are comparable
+            ratio = new_time / old_time if old_time else float('nan')
+            print('{:<8} {:<12} {:>9.2f}ms {:>9.2f}ms {:>7.2f}x'.format(lang, stage, old_time * 1000,
+                                                                      new_time * 1000, ratio))
+
+
+def main(args):
+    langs = args.lang or sorted(os.listdir(get_test_data_dir_path()))
+    results = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'replicas': args.replicas,
+        'languages': {},
+    }
+    error_num = 0
+    for lang in langs:
+        result = benchmark_language(lang, args.replicas)
+        results['languages'][lang] = result
+        error_num += result['errors']
+        print('{}: {:.1f} pages/sec, {:.1f} entries/sec, {} errors ({})'.format(
+            lang, result['pages_per_sec'], result['entries_per_sec'], result['errors'],
+            ', '.join('{} {:.3f}s'.format(stage, result['stages'][stage]) for stage in STAGES)), file=sys.stderr)
+    # kilobytes on Linux
+    results['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print('peak RSS: {} KB'.format(results['peak_rss_kb']), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+    if error_num:
+        sys.exit('{} extractor calls failed'.format(error_num))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark extractors on the test data')
+    parser.add_argument('--lang', action='append', help='language (default: every language with test data)')
+    parser.add_argument('-n', '--replicas', type=int, default=10, help='number of times each page is processed')
+    parser.add_argument('--output', '-o', help='path to save the results as JSON')
+    parser.add_argument('--compare', help='results of a previous run to compare with')
+
+    main(parser.parse_args())
@@ -0,0 +1,28 @@
+import sys
+
+from wiktionary_extractor.index import DEFAULT_RUN_SIZE, IndexReader, build_index
+
+
+def main(args):
+    if args.lookup:
+        with IndexReader(args.dst) as index:
+            for form in args.src:
+                for entry in index.lookup(form):
+                    print('{}\t{!r}'.format(form, entry))
+        return
+    entry_num = build_index(args.src, args.dst, args.run_size, args.tmp_dir)
+    print('Indexed {} entries into {}.index'.format(entry_num, args.dst), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a lemma/variant lookup index over extracted entries')
+    parser.add_argument('dst', help='path prefix of the index (<dst>.index and <dst>.data)')
+    parser.add_argument('src', nargs='+', help='output files of main.py (.gz/.zst supported, - for stdin)')
+    parser.add_argument(
+        '--run-size', type=int, default=DEFAULT_RUN_SIZE, help='number of postings sorted in memory at a time')
+    parser.add_argument('--tmp-dir', help='directory for the sorted runs (default: system temporary directory)')
+    parser.add_argument('--lookup', action='store_true', help='look up the given forms in <dst> instead of building it')
+
+    main(parser.parse_args())
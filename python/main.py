@@ -1,22 +1,78 @@
-import json
-import multiprocessing
+import multiprocessing.pool
 import os
+import signal
 import sys
+from collections import Counter
 
-from wiktionary_extractor.util import get_extractors
-from wiktionary_extractor.extractor import extract_from_path
+from wiktionary_extractor.cache import ExtractionCache, get_version
+from wiktionary_extractor.checkpoint import Checkpoint
+from wiktionary_extractor.dispatch import PREFILTER_MODES
+from wiktionary_extractor.inputs import FLUSH, READ_MODES, StreamReader, expand, get_task_id, is_stream
+from wiktionary_extractor.merge import list_parts
+from wiktionary_extractor.schedule import SCHEDULES, get_max_batch_bytes, get_sizes, get_tail, order_paths, \
+    read_manifest
+from wiktionary_extractor.util import get_language_module
+from wiktionary_extractor.worker import PendingLimit, RecyclingPool, extract_batch, init_worker, make_batches, \
+    merge_stats
+from wiktionary_extractor.writer import DEFAULT_BUFFER_SIZE, DEFAULT_FLUSH_INTERVAL, NDJSONWriter, get_encoder, \
+    get_resume_path, open_output, reformat
 
 
-def reformat(obj):
-    lemma, _, _, variants, _ = obj
-    keys = [lemma] + [form for _, form in variants]
-    keys = [key.lower() for key in keys]
-    return [obj, keys]
+def get_checkpoint_key(task, streams=frozenset()):
+    # shard records and archive members are tracked individually, against the stat of their file;
+    # pages of the `streams` are not tracked (None), as a stream cannot be read again
+    if isinstance(task, tuple):
+        path, member = get_task_id(task)
+        if path in streams:
+            return None, None
+        return path, '{}#{}'.format(os.path.abspath(path), member)
+    return task, None
+
+
+def report_unmatched(unmatched):
+    print('Headlines without extractor:', file=sys.stderr)
+    for headline, count in sorted(unmatched.items(), key=lambda item: (-item[1], item[0])):
+        print('{}\t{}'.format(count, headline), file=sys.stderr)
+
+
+def report_prefilter(prefiltered, verify):
+    print('Prefilter skipped {} pages'.format(prefiltered['skipped']), file=sys.stderr)
+    if verify:
+        print('Prefilter would have dropped entries of {} pages'.format(prefiltered['missed']), file=sys.stderr)
+
+
+def report_schedule(schedule, tail, input_tail):
+    # share of the run during which some worker is idle, simulated with the page sizes as costs
+    print('Schedule {}: straggler tail {:.1%} of the run (input order: {:.1%})'.format(schedule, tail, input_tail),
+          file=sys.stderr)
+
+
+def exit_on_sigterm(signum, frame):
+    # unwind normally so that buffered output is flushed
+    sys.exit(128 + signum)
 
 
 def main(args):
-    # get extractors
-    extractors = get_extractors(args.lang)
+    if args.manifest is not None and args.schedule == 'input':
+        sys.exit('--manifest needs --schedule')
+    if args.output_dir is not None and args.output != '-':
+        sys.exit('--output and --output-dir are exclusive')
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None and args.output_dir is not None:
+        checkpoint_path = os.path.join(args.output_dir, 'checkpoint')
+    elif checkpoint_path is None and args.output != '-':
+        checkpoint_path = args.output + '.checkpoint'
+    if args.resume and checkpoint_path is None:
+        sys.exit('--resume needs --output or --checkpoint')
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if not args.resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    if not args.resume and args.output_dir is not None:
+        # the workers of this run write new part files, which would be merged with the old ones
+        for path in list_parts([args.output_dir]):
+            os.remove(path)
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path is not None else None
 
     def generate_paths():
         for root in args.root:
@@ -27,20 +83,136 @@ def main(args):
             else:
                 yield root
 
+    # streams can only be given as roots
+    streams = frozenset(root for root in args.root if is_stream(root))
+    stream_readers = []
+
+    def generate_tasks(paths):
+        for path in paths:
+            if path in streams:
+                reader = StreamReader(path, args.chunksize)
+                stream_readers.append(reader)
+                yield from reader
+            else:
+                yield from expand(path)
+
+    def filter_done(tasks):
+        for task in tasks:
+            if task is FLUSH:
+                yield task
+                continue
+            path, key = get_checkpoint_key(task, streams)
+            if path is not None and checkpoint.is_done(path, key):
+                print('Already extracted, skipped: ' + str(get_task_id(task)), file=sys.stderr)
+            else:
+                yield task
+
+    cache = None
+    version = None
+    if args.cache:
+        # created by the parent, which is the only writer
+        version = get_version(get_language_module(args.lang))
+        cache = ExtractionCache(args.cache, version)
+    max_rss = args.max_rss and args.max_rss * 1024 * 1024
+    # skipped pages are not parsed, so their headlines could not be reported
+    prefilter = 'off' if args.report_unmatched and args.prefilter == 'on' else args.prefilter
+    init_args = (args.lang, args.cache, version, args.profile, args.cprofile, max_rss, args.output_dir, args.fast_json,
+                 prefilter, args.read)
+
+    pool = None
     if args.worker == 1:
+        init_worker(*init_args)
         map_func = map
     else:
-        pool = multiprocessing.Pool(args.worker)
-        map_func = pool.imap
+        pool_class = RecyclingPool if max_rss else multiprocessing.pool.Pool
+        pool = pool_class(
+            args.worker, initializer=init_worker, initargs=init_args, maxtasksperchild=args.max_tasks_per_child)
+        map_func = pool.imap_unordered if args.unordered else pool.imap
 
-    def generate_args(paths):
-        for path in paths:
-            yield path, extractors
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
 
-    for objs in map_func(extract_from_path, generate_args(generate_paths())):
-        for obj in objs:
-            print(json.dumps(reformat(obj)))
-            sys.stdout.flush()
+    paths = generate_paths()
+    sizes = None
+    max_bytes = None
+    if args.schedule != 'input':
+        # every path is listed and sized up front; streams are left to the end in their order
+        paths = list(paths)
+        files = [path for path in paths if path not in streams]
+        manifest = read_manifest(args.manifest) if args.manifest is not None else None
+        sizes = get_sizes(files, manifest)
+        max_bytes = get_max_batch_bytes(sizes, args.chunksize, args.schedule)
+        input_tail = get_tail(make_batches(files, args.chunksize), sizes, args.worker)
+        files = order_paths(files, sizes, args.schedule)
+        tail = get_tail(make_batches(files, args.chunksize, sizes, max_bytes), sizes, args.worker)
+        paths = files + [path for path in paths if path in streams]
+
+    tasks = generate_tasks(paths)
+    if args.resume:
+        tasks = filter_done(tasks)
+
+    writer = None
+    if args.output_dir is None:
+        output_path = get_resume_path(args.output) if args.resume else args.output
+        if output_path != args.output:
+            print('Resumed output goes to ' + output_path, file=sys.stderr)
+        writer = NDJSONWriter(
+            open_output(output_path, append=args.resume),
+            buffer_size=args.buffer_size,
+            flush_interval=args.flush_interval,
+            encode=get_encoder(args.fast_json),
+            on_flush=checkpoint and checkpoint.commit)
+    stats = {}
+    pending = PendingLimit(args.max_pending or 4 * args.worker)
+    try:
+        batches = make_batches(tasks, args.chunksize, sizes, max_bytes)
+        for results, batch_stats in map_func(extract_batch, pending.feed(batches)):
+            pending.release()
+            merge_stats(stats, batch_stats)
+            for task, entry_num, objs, content_hash in results:
+                if writer:
+                    for obj in objs:
+                        writer.write(reformat(obj))
+                if checkpoint:
+                    path, key = get_checkpoint_key(task, streams)
+                    if path is not None:
+                        checkpoint.add(path, entry_num, key)
+                if cache and content_hash:
+                    cache.put(content_hash, objs)
+            if cache:
+                cache.commit()
+            if checkpoint and not writer:
+                # the workers have flushed their part files
+                checkpoint.commit()
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        # unblock the pool's task handler, which is joined when the pool is terminated
+        pending.close()
+        for reader in stream_readers:
+            reader.close()
+        if pool is not None:
+            pool.terminate()
+        if writer:
+            writer.close()
+        if checkpoint:
+            checkpoint.close()
+        if cache:
+            cache.close()
+
+    if args.schedule != 'input':
+        report_schedule(args.schedule, tail, input_tail)
+    if args.report_unmatched:
+        report_unmatched(stats.get('unmatched', {}))
+    if prefilter != 'off' and (args.report_unmatched or prefilter == 'verify'):
+        report_prefilter(stats.get('prefilter', Counter()), prefilter == 'verify')
+    if 'profile' in stats:
+        if args.profile:
+            stats['profile'].print()
+        if args.cprofile:
+            stats['profile'].dump_pstats(args.cprofile_output)
+    if prefilter == 'verify' and stats.get('prefilter', Counter())['missed']:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -48,8 +220,72 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='Extract word definitions')
     parser.add_argument('lang', help='language')
-    parser.add_argument('root', nargs='+', help='directory of downloaded HTML')
+    parser.add_argument(
+        'root',
+        nargs='+',
+        help='directory of downloaded HTML, HTML file (.gz or .zst), .shard file, .zip or .tar archive, '
+        'or stream of records from the downloader\'s -stream on a named pipe or stdin (-)')
     parser.add_argument(
         '--worker', type=int, default=1, help='number of workers')
+    parser.add_argument(
+        '--chunksize', type=int, default=16, help='number of files sent to a worker at a time')
+    parser.add_argument(
+        '--schedule',
+        choices=SCHEDULES,
+        default='input',
+        help='order of the pages: as listed, largest first, or largest first in batches of about equal size')
+    parser.add_argument(
+        '--manifest', help='sizes of the pages for --schedule instead of stat, e.g. the checkpoint of an earlier run')
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        help='number of batches read ahead of the results, which bounds how fast a stream is consumed '
+        '(default: 4 per worker)')
+    parser.add_argument(
+        '--max-tasks-per-child', type=int, help='number of batches after which a worker is replaced')
+    parser.add_argument(
+        '--max-rss', type=int, metavar='MB', help='replace a worker after a batch once its RSS exceeds this')
+    parser.add_argument(
+        '--unordered', action='store_true', help='write results as soon as they are ready, in any order')
+    parser.add_argument(
+        '--output', '-o', default='-', help='output path (.gz or .zst to compress; stdout by default)')
+    parser.add_argument(
+        '--output-dir', help='let every worker write its own part-<pid>.ndjson here, to be combined by merge.py')
+    parser.add_argument(
+        '--buffer-size', type=int, default=DEFAULT_BUFFER_SIZE, help='bytes of output buffered before writing')
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help='maximum seconds between flushes (checked on write)')
+    parser.add_argument(
+        '--fast-json', action='store_true', help='encode with orjson when it is installed')
+    parser.add_argument(
+        '--report-unmatched', action='store_true', help='print headlines which had no extractor at the end')
+    parser.add_argument(
+        '--prefilter',
+        choices=PREFILTER_MODES,
+        default='on',
+        help='skip pages whose bytes have no headline with an extractor before parsing them; '
+        'verify extracts every page and fails if a skipped one had entries (off with --report-unmatched)')
+    parser.add_argument(
+        '--read',
+        choices=READ_MODES,
+        default='read',
+        help='how pages are read: in one read() call, or memory-mapped so that pages skipped by the prefilter '
+        'are never copied')
+    parser.add_argument(
+        '--profile', action='store_true', help='time every extractor call and print a report at the end')
+    parser.add_argument(
+        '--cprofile', metavar='EXTRACTOR', help='run one extractor (e.g. en_de.verb_extractor) under cProfile')
+    parser.add_argument(
+        '--cprofile-output', default='extractor.pstats', help='where to dump the stats of --cprofile')
+    parser.add_argument(
+        '--checkpoint', help='manifest of processed files (default: <output>.checkpoint when --output is given)')
+    parser.add_argument(
+        '--cache', help='SQLite cache of extracted objects keyed by page content and extractor version')
+    parser.add_argument(
+        '--resume', action='store_true', help='skip files recorded in the checkpoint and append to the output '
+        '(or, if it is compressed, write next to it as <output>.1.gz, ...)')
 
     main(parser.parse_args())
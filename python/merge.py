@@ -0,0 +1,34 @@
+import sys
+
+from wiktionary_extractor.merge import DEFAULT_RUN_SIZE, merge_parts
+from wiktionary_extractor.writer import open_output
+
+
+def main(args):
+    stream = open_output(args.output)
+    try:
+        line_num = merge_parts(args.parts, stream, args.run_size * 1024 * 1024, args.tmp_dir)
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        else:
+            stream.flush()
+    print('Merged {} entries'.format(line_num), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Merge the part files of main.py --output-dir into one sorted output')
+    parser.add_argument('parts', nargs='+', help='part files or directories containing them')
+    parser.add_argument(
+        '--output', '-o', default='-', help='output path (.gz or .zst to compress; stdout by default)')
+    parser.add_argument(
+        '--run-size',
+        type=int,
+        default=DEFAULT_RUN_SIZE >> 20,
+        metavar='MB',
+        help='bytes of lines sorted in memory at a time')
+    parser.add_argument('--tmp-dir', help='where sorted runs are spilled (default: system temporary directory)')
+
+    main(parser.parse_args())
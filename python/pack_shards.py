@@ -0,0 +1,23 @@
+import sys
+
+from wiktionary_extractor.shards import COMPRESSIONS, pack_directory
+
+
+def main(args):
+    shard_paths = pack_directory(args.src, args.dst, args.records_per_shard, COMPRESSIONS[args.compression])
+    for shard_path in shard_paths:
+        print(shard_path, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pack downloaded HTML files into shards')
+    parser.add_argument('src', help='directory of downloaded HTML')
+    parser.add_argument('dst', help='path prefix of the shards')
+    parser.add_argument(
+        '--records-per-shard', type=int, default=10000, help='number of pages per shard')
+    parser.add_argument(
+        '--compression', choices=sorted(COMPRESSIONS), default='none', help='compression of each page')
+
+    main(parser.parse_args())
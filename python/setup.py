@@ -9,4 +9,5 @@ setup(
     packages=find_packages(),
     requires=[
         'bs4',
+        'lxml',
     ])
@@ -0,0 +1,15 @@
+from wiktionary_extractor.cache import ExtractionCache
+from wiktionary_extractor.entry import Entry
+
+
+def test_keyed_by_version(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    objs = [Entry('Hund', 'noun', ['m'], [([], 'Hunde'), ('plural', 'Hunde')], ['dog'])]
+
+    cache = ExtractionCache(path, 'v1')
+    cache.put('abc', objs)
+    cache.close()
+
+    assert ExtractionCache(path, 'v1', readonly=True).get('abc') == objs
+    assert ExtractionCache(path, 'v2', readonly=True).get('abc') is None
+    assert ExtractionCache(path, 'v1', readonly=True).get('def') is None
@@ -0,0 +1,31 @@
+from wiktionary_extractor.checkpoint import Checkpoint
+
+
+def test_resume(tmp_path):
+    page = tmp_path / '1.html'
+    page.write_text('<p>x</p>')
+    manifest = str(tmp_path / 'out.checkpoint')
+
+    checkpoint = Checkpoint(manifest)
+    checkpoint.add(str(page), 1)
+    assert not checkpoint.is_done(str(page))
+    checkpoint.commit()
+    assert checkpoint.is_done(str(page))
+    checkpoint.close()
+
+    # an interrupted write leaves a partial record behind
+    with open(manifest, 'a') as f:
+        f.write('{"path": "/tmp/2.ht')
+
+    checkpoint = Checkpoint(manifest)
+    assert checkpoint.is_done(str(page))
+    other = tmp_path / '3.html'
+    other.write_text('<p>y</p>')
+    checkpoint.add(str(other), 0)
+    checkpoint.close()
+
+    checkpoint = Checkpoint(manifest)
+    assert checkpoint.is_done(str(other))
+    page.write_text('<p>changed</p>')
+    assert not checkpoint.is_done(str(page))
+    checkpoint.close()
@@ -0,0 +1,22 @@
+from wiktionary_extractor.common import default_extractor
+from wiktionary_extractor.dispatch import Dispatcher
+
+
+def noun_extractor(section):
+    return None
+
+
+def test_lookup():
+    dispatcher = Dispatcher({
+        'Proper noun': ('proper-noun', noun_extractor),
+        'Noun': 'noun',
+        'Pro': 'pro',
+    })
+    assert dispatcher.lookup('Noun 2') == [('noun', default_extractor)]
+    # every matching prefix applies, in the order of the table
+    assert dispatcher.lookup('Proper noun') == [('proper-noun', noun_extractor), ('pro', default_extractor)]
+    assert dispatcher.lookup('Pronunciation') == [('pro', default_extractor)]
+    assert dispatcher.lookup('Etymology') == []
+    assert dispatcher.lookup('Etymology') == []
+    assert dispatcher.pop_unmatched() == {'Etymology': 2}
+    assert dispatcher.pop_unmatched() == {}
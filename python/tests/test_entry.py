@@ -0,0 +1,29 @@
+import pickle
+
+import pytest
+
+from wiktionary_extractor.entry import Entry
+from wiktionary_extractor.extractor import remove_duplicates
+
+
+def test_entry():
+    entry = Entry('Hund', 'noun', ['m'], [(['DIM'], 'Hündchen'), ('plural', 'Hunde')], ['dog'])
+    assert entry.variants == ((('DIM', ), 'Hündchen'), ('plural', 'Hunde'))
+    lemma, pos, attrs, variants, defs = entry
+    assert (lemma, pos, attrs, defs) == ('Hund', 'noun', ('m', ), ('dog', ))
+
+    with pytest.raises(AttributeError):
+        entry.lemma = 'Katze'
+
+    same = pickle.loads(pickle.dumps(entry))
+    assert same == entry and hash(same) == hash(entry)
+    assert len({entry, same}) == 1
+
+    other = Entry('Haus', 'noun', ['n'], [], ['house'])
+    assert sorted([entry, other]) == [other, entry]
+    assert Entry.deconvert(entry.convert()) == entry
+
+
+def test_remove_duplicates():
+    variants = [(('PP', ), 'gemacht'), (['PP'], 'gemacht'), ('plural', 'Hunde'), ((), 'machen'), ('plural', 'Hunde')]
+    assert remove_duplicates(variants) == [(('PP', ), 'gemacht'), ('plural', 'Hunde'), ((), 'machen')]
@@ -0,0 +1,29 @@
+from wiktionary_extractor.index import IndexReader, build_index, get_keys
+from wiktionary_extractor.test_util import run_extractors_on_test_data
+from wiktionary_extractor.writer import get_encoder
+
+
+def test_build_and_lookup(tmp_path):
+    entries = []
+    for _, parsed in run_extractors_on_test_data('en-de'):
+        entries.extend(parsed)
+    encode = get_encoder()
+    src_path = tmp_path / 'out.ndjson'
+    with open(src_path, 'wb') as f:
+        for entry in entries:
+            f.write(encode([entry, get_keys(entry)]) + b'\n')
+
+    assert build_index([str(src_path)], str(tmp_path / 'de')) == len(entries)
+    with IndexReader(str(tmp_path / 'de')) as index:
+        for entry in entries:
+            assert entry in index.lookup(entry.lemma)
+            for key in get_keys(entry):
+                assert entry in index.lookup(key)
+        form = get_keys(entries[0])[-1]
+        assert index.lookup(form) == [entry for entry in entries if form in get_keys(entry)]
+        assert index.lookup('no such form') == []
+
+    # spilled to many runs, the index is the same
+    assert build_index([str(src_path)], str(tmp_path / 'de-runs'), run_size=3) == len(entries)
+    for extension in ['.data', '.index']:
+        assert (tmp_path / ('de-runs' + extension)).read_bytes() == (tmp_path / ('de' + extension)).read_bytes()
@@ -0,0 +1,115 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import threading
+import zipfile
+
+from wiktionary_extractor import inputs
+from wiktionary_extractor.extractor import extract_from_path, extract_from_source
+from wiktionary_extractor.test_util import get_test_data_dir_path
+from wiktionary_extractor.util import get_backend, get_extractors
+from wiktionary_extractor.worker import PendingLimit, make_batches
+
+
+def get_html_dir():
+    return os.path.join(get_test_data_dir_path(), 'en-de', 'html', 'noun')
+
+
+def test_archives(tmp_path):
+    html_dir = get_html_dir()
+    names = sorted(os.listdir(html_dir))
+    zip_path = str(tmp_path / 'de.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            archive.write(os.path.join(html_dir, name), name)
+    tar_path = str(tmp_path / 'de.tar.gz')
+    with tarfile.open(tar_path, 'w:gz') as archive:
+        for name in names:
+            archive.add(os.path.join(html_dir, name), name)
+
+    extractors = get_extractors('en-de')
+    backend = get_backend('en-de')
+    for archive_path in [zip_path, tar_path]:
+        tasks = list(inputs.expand(archive_path))
+        assert [inputs.get_task_id(task) for task in tasks] == [(archive_path, name) for name in names]
+        for task in tasks:
+            name, data = inputs.load(task)
+            path = os.path.join(html_dir, name)
+            assert extract_from_source(name, data, extractors, backend) == \
+                extract_from_path((path, extractors, backend))
+
+
+def test_read_file(tmp_path):
+    path = os.path.join(get_html_dir(), sorted(os.listdir(get_html_dir()))[0])
+    with open(path, 'rb') as f:
+        data = f.read()
+    gz_path = str(tmp_path / 'page.html.gz')
+    with gzip.open(gz_path, 'wb') as f:
+        f.write(data)
+    assert inputs.load(gz_path) == (gz_path, data)
+
+    _, mapped = inputs.load(path, 'mmap')
+    assert not isinstance(mapped, bytes)
+    assert mapped[:] == data
+    extractors = get_extractors('en-de')
+    assert extract_from_source(path, mapped, extractors) == extract_from_source(path, data, extractors)
+
+
+def test_iter_stream():
+    records = [{'oldid': '1', 'title': 'Haus', 'html': '<p>Häuser</p>'}, {'oldid': '2', 'title': 'x', 'html': ''}]
+    lines = [json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n' for record in records]
+    # torn last record
+    stream = io.BytesIO(b''.join(lines) + lines[0][:10])
+    assert list(inputs.iter_stream(stream)) == [('1.html', '<p>Häuser</p>'.encode('utf-8')), ('2.html', b'')]
+
+
+def test_pending_limit():
+    read = []
+
+    def batches():
+        for i in range(5):
+            read.append(i)
+            yield [i]
+
+    limit = PendingLimit(2)
+    fed = limit.feed(batches())
+    assert [next(fed), next(fed)] == [[0], [1]]
+    # the third batch is only read once a result is released
+    thread = threading.Thread(target=next, args=(fed, ), daemon=True)
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive() and read == [0, 1]
+    limit.release()
+    thread.join()
+    assert read == [0, 1, 2]
+    limit.close()
+    assert list(fed) == []
+
+
+def test_stream_reader(tmp_path):
+    path = str(tmp_path / 'fifo')
+    os.mkfifo(path)
+    record = json.dumps({'oldid': '1', 'title': 'Haus', 'html': '<p>Haus</p>'}).encode('utf-8') + b'\n'
+    written = threading.Event()
+
+    def produce():
+        # one record, then the producer stalls with the pipe open
+        with open(path, 'wb') as f:
+            f.write(record)
+            f.flush()
+            written.wait()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    reader = inputs.StreamReader(path)
+    tasks = iter(reader)
+    # the record goes out in a batch of its own instead of waiting for more
+    batches = make_batches(tasks, 16)
+    assert next(batches) == [(path, '1.html', b'<p>Haus</p>')]
+    # a reader blocked on the producer is abandoned on close
+    reader.close()
+    assert list(batches) == []
+    written.set()
+    producer.join()
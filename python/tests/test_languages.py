@@ -0,0 +1,42 @@
+import subprocess
+import sys
+import types
+
+import pytest
+
+from wiktionary_extractor import languages
+from wiktionary_extractor.util import get_dispatcher
+
+
+def test_lazy_import():
+    code = ('import sys\n'
+            'from wiktionary_extractor.util import get_dispatcher\n'
+            'get_dispatcher("en-de")\n'
+            'print(sorted(m for m in sys.modules if m.startswith("wiktionary_extractor.languages.")))')
+    out = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True)
+    assert out.strip() == "['wiktionary_extractor.languages.en_de']"
+
+
+def test_dispatcher_cache():
+    assert get_dispatcher('en-de') is get_dispatcher('en-de')
+    assert get_dispatcher('en-de') is not get_dispatcher('en-es')
+
+
+class EntryPoint(object):
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+
+    def load(self):
+        return self.module
+
+
+def test_entry_point(monkeypatch):
+    plugin = types.ModuleType('en_xx')
+    plugin.get_extractors = lambda: {'Noun': 'noun'}
+    monkeypatch.setattr(languages, 'iter_entry_points', lambda: [EntryPoint('en-xx', plugin)])
+    monkeypatch.setattr(languages, '_modules', {})
+    assert languages.get_module('en-xx') is plugin
+    assert 'en_xx' in languages.list_languages()
+    with pytest.raises(ValueError):
+        languages.get_module('en-yy')
@@ -0,0 +1,42 @@
+import pytest
+
+from wiktionary_extractor import common, lxml_common
+from wiktionary_extractor.extractor import extract_entries
+from wiktionary_extractor.test_util import list_test_data
+
+HTML_PATHS = [
+    html_path for lang in ['en-de', 'en-en', 'en-es', 'en-ko']
+    for html_path in sorted(list_test_data(lang))
+]
+
+
+def _run(module, section):
+    try:
+        obj = module.default_extractor(section, True)
+    except Exception as ex:
+        return type(ex)
+    tables = []
+    for head, table in module.extract_tables(section):
+        if table is None:
+            tables.append((head, None))
+            continue
+        trs = table.findall('.//tr') if module is lxml_common else table.find_all('tr')
+        cells = []
+        for i in range(len(trs)):
+            for j in range(2):
+                try:
+                    cells.append((module.get_th(trs, i, j), module.get_cell(trs, i, j),
+                                  module.get_cell(trs, i, j, True)))
+                except IndexError:
+                    cells.append(None)
+        tables.append((head, cells))
+    return obj, tables
+
+
+@pytest.mark.parametrize('html_path', HTML_PATHS)
+def test_same_as_bs4(html_path):
+    bs4_sections = list(extract_entries(html_path, 'bs4'))
+    lxml_sections = list(extract_entries(html_path, 'lxml'))
+    assert [s.headline for s in bs4_sections] == [s.headline for s in lxml_sections]
+    for bs4_section, lxml_section in zip(bs4_sections, lxml_sections):
+        assert _run(common, bs4_section) == _run(lxml_common, lxml_section)
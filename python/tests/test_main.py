@@ -0,0 +1,51 @@
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from wiktionary_extractor.merge import list_parts, merge_parts
+from wiktionary_extractor.test_util import list_test_data
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'main.py')
+
+
+def run_main(*args):
+    subprocess.check_call([sys.executable, MAIN_PATH] + list(args), stderr=subprocess.DEVNULL)
+
+
+def test_output_dir_is_cleared(tmp_path):
+    paths = sorted(list_test_data('en-de'))
+    output_dir = str(tmp_path / 'parts')
+    run_main('en-de', *paths, '--output-dir', output_dir, '--worker', '2')
+    run_main('en-de', paths[0], '--output-dir', output_dir)
+    out = io.BytesIO()
+    merge_parts([output_dir], out)
+
+    expected_path = str(tmp_path / 'expected.ndjson')
+    run_main('en-de', paths[0], '-o', expected_path)
+    with open(expected_path, 'rb') as f:
+        assert sorted(out.getvalue().splitlines()) == sorted(f.read().splitlines())
+
+
+def test_stream_sigterm(tmp_path):
+    # a run reading a stalled stream exits once terminated, instead of waiting for the producer
+    path = str(tmp_path / 'fifo')
+    os.mkfifo(path)
+    with open(sorted(list_test_data('en-de'))[0], encoding='utf-8') as f:
+        record = json.dumps({'oldid': '1', 'title': 'x', 'html': f.read()})
+    output_dir = str(tmp_path / 'parts')
+    process = subprocess.Popen([sys.executable, MAIN_PATH, 'en-de', path, '--output-dir', output_dir, '--worker', '2'],
+                               stderr=subprocess.DEVNULL)
+    with open(path, 'w') as producer:
+        producer.write(record + '\n')
+        producer.flush()
+        # the record is extracted while the stream stays open
+        deadline = time.time() + 30
+        while not (os.path.isdir(output_dir) and any(os.path.getsize(part) for part in list_parts([output_dir]))):
+            assert time.time() < deadline
+            time.sleep(0.1)
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 128 + signal.SIGTERM
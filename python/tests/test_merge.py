@@ -0,0 +1,26 @@
+import io
+import json
+
+from wiktionary_extractor.merge import merge_parts
+from wiktionary_extractor.test_util import run_extractors_on_test_data
+from wiktionary_extractor.writer import get_encoder, reformat
+
+
+def test_merge_parts(tmp_path):
+    encode = get_encoder()
+    lines = []
+    for _, parsed in run_extractors_on_test_data('en-de'):
+        lines.extend(encode(reformat(obj)) + b'\n' for obj in parsed)
+
+    # every entry is in two parts, the last one torn by a killed worker
+    parts = [tmp_path / 'part-1.ndjson', tmp_path / 'part-2.ndjson']
+    parts[0].write_bytes(b''.join(lines[::-1]))
+    parts[1].write_bytes(b''.join(lines) + lines[0][:10])
+    (tmp_path / 'checkpoint').write_text('')
+
+    out = io.BytesIO()
+    assert merge_parts([str(tmp_path)], out, run_size=200, tmp_dir=str(tmp_path)) == len(lines)
+    merged = out.getvalue().splitlines(keepends=True)
+    assert sorted(merged) == sorted(lines)
+    keys = [(obj[0], obj[1]) for obj, _ in map(json.loads, merged)]
+    assert keys == sorted(keys)
@@ -0,0 +1,30 @@
+import pytest
+
+from wiktionary_extractor.dispatch import Dispatcher, compile_prefilter
+from wiktionary_extractor.extractor import extract_from_source, read_source
+from wiktionary_extractor.test_util import list_test_data
+from wiktionary_extractor.util import get_backend, get_extractors
+
+
+def test_compile_prefilter():
+    prefilter = compile_prefilter(['Noun', 'Proper noun'])
+    assert prefilter.search(b'<span class="mw-headline" id="Noun_2">Noun 2</span>')
+    assert prefilter.search(b'<span id="x" class="mw-headline"><i>Proper noun</i></span>')
+    assert not prefilter.search(b'<span class="mw-headline" id="Etymology">Etymology</span>')
+    assert not prefilter.search(b'<p>Noun</p>')
+    # names which may be escaped in HTML, or empty ones, disable filtering
+    assert compile_prefilter(['Noun', 'Q&A']) is None
+    assert compile_prefilter(['']) is None
+
+
+@pytest.mark.parametrize('lang', ['en-de', 'en-en', 'en-es', 'en-ko'])
+def test_prefilter_never_drops_entries(lang):
+    dispatcher = Dispatcher(get_extractors(lang), get_backend(lang), prefilter='off')
+    verifier = Dispatcher(get_extractors(lang), get_backend(lang), prefilter='verify')
+    for html_path in list_test_data(lang):
+        source = read_source(html_path)
+        entries = extract_from_source(html_path, source, dispatcher)
+        assert extract_from_source(html_path, source, verifier) == entries
+        if entries:
+            assert verifier.may_match(source), html_path
+    assert verifier.pop_prefiltered()['missed'] == 0
@@ -0,0 +1,25 @@
+import pytest
+
+from wiktionary_extractor.dispatch import Dispatcher
+from wiktionary_extractor.extractor import extract_from_path, parse
+from wiktionary_extractor.prune import Pruner
+from wiktionary_extractor.test_util import list_test_data
+from wiktionary_extractor.util import get_backend, get_extractors
+
+
+def test_parse_pruned():
+    html = (b'<div class="toc">Contents</div><p>a<span class="mw-editsection">edit</span>b'
+            b'<script>x</script>c<span class="maintenance-line">?</span><!-- d --></p>'
+            b'<div class="maintenance-line">kept</div>')
+    root = parse(html, Pruner())
+    assert root.find('p').text == 'abc'
+    assert root.find('div').text == 'kept'
+    assert parse(html).find('p').text == 'aeditbc?'
+
+
+@pytest.mark.parametrize('lang', ['en-de', 'en-en', 'en-es', 'en-ko'])
+def test_pruning_keeps_entries(lang):
+    whole = Dispatcher(get_extractors(lang), get_backend(lang), pruned_classes=None)
+    pruned = Dispatcher(get_extractors(lang), get_backend(lang))
+    for html_path in list_test_data(lang):
+        assert extract_from_path((html_path, pruned, None)) == extract_from_path((html_path, whole, None))
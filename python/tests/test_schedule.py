@@ -0,0 +1,29 @@
+import json
+
+from wiktionary_extractor.schedule import get_max_batch_bytes, get_sizes, get_tail, order_paths, read_manifest
+from wiktionary_extractor.worker import make_batches
+
+
+def test_schedule(tmp_path):
+    sizes = {}
+    for name, size in [('a', 1), ('b', 100), ('c', 2), ('d', 50), ('e', 1)]:
+        path = str(tmp_path / name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        sizes[path] = size
+    paths = list(sizes)
+    manifest_path = str(tmp_path / 'manifest')
+    with open(manifest_path, 'w') as f:
+        f.write(json.dumps({'path': paths[1], 'size': 1000}) + '\n')
+    assert get_sizes(paths) == sizes
+    assert get_sizes(paths, read_manifest(manifest_path))[paths[1]] == 1000
+
+    largest_first = order_paths(paths, sizes, 'largest-first')
+    assert largest_first == [paths[i] for i in [1, 3, 2, 0, 4]]
+    assert list(make_batches(largest_first, 2)) == [largest_first[:2], largest_first[2:4], largest_first[4:]]
+    # the two largest pages are not batched together
+    max_bytes = get_max_batch_bytes(sizes, 2, 'balanced')
+    assert max_bytes == 154 / 3
+    balanced = list(make_batches(largest_first, 2, sizes, max_bytes))
+    assert balanced == [largest_first[:1], largest_first[1:3], largest_first[3:]]
+    assert get_tail(balanced, sizes, 2) < get_tail(make_batches(paths, 2), sizes, 2)
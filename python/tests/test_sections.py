@@ -0,0 +1,95 @@
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from wiktionary_extractor.common import extract_tables
+from wiktionary_extractor.dispatch import compile_extractors
+from wiktionary_extractor.extractor import extract, extract_entries
+from wiktionary_extractor.languages.en_ko import find_conjugation_section
+from wiktionary_extractor.sections import index_sections
+from wiktionary_extractor.test_util import get_test_data_dir_path, list_test_data
+from wiktionary_extractor.util import get_backend, get_extractors
+
+
+def test_index_sections():
+    path = os.path.join(get_test_data_dir_path(), 'en-de', 'html', 'verb', '44034843.html')
+    with open(path) as f:
+        soup = BeautifulSoup(f, 'lxml')
+    sections = index_sections(soup)
+
+    assert [(s.headline, s.level) for s in sections] == [
+        ('German', 2),
+        ('Etymology', 3),
+        ('Pronunciation', 3),
+        ('Verb', 3),
+        ('Conjugation', 4),
+        ('Further reading', 3),
+    ]
+
+    # a section includes its subsections and stops at the next headline of the same level
+    verb = sections[3]
+    assert verb.end is sections[5].node
+    assert sections[4].node in list(verb.siblings())
+    assert sections[0].end is None
+
+
+def test_extract_tables_stops_at_next_section():
+    html = '''
+<h3><span class="mw-headline">Noun</span></h3>
+<div class="NavFrame"><div class="NavHead">Declension of A</div><table></table></div>
+<h3><span class="mw-headline">Verb</span></h3>
+<div class="NavFrame"><div class="NavHead">Conjugation of B</div><table></table></div>
+'''
+    noun, verb = index_sections(BeautifulSoup(html, 'lxml'))
+    assert [head for head, _ in extract_tables(noun)] == ['Declension of A']
+    assert [head for head, _ in extract_tables(verb)] == ['Conjugation of B']
+
+
+def test_section_tree():
+    path = os.path.join(get_test_data_dir_path(), 'en-ko', 'html', 'verb', '47721344.html')
+    with open(path) as f:
+        soup = BeautifulSoup(f, 'lxml')
+    sections = index_sections(soup)
+    by_id = {s.node.span['id']: s for s in sections}
+
+    etymology = by_id['Etymology_2']
+    assert etymology.parent is by_id['Korean']
+    assert [s.headline for s in etymology.children] == ['Verb', 'Adjective', 'Conjugation']
+    assert [s.node.span['id'] for s in by_id['Adjective'].following()] == ['Conjugation_2', 'Synonyms_2', 'References']
+
+    # a Conjugation section belongs to the closest entry before it
+    assert find_conjugation_section(by_id['Verb']) is by_id['Conjugation']
+    assert find_conjugation_section(by_id['Verb_2']) is None
+    assert find_conjugation_section(by_id['Adjective']) is by_id['Conjugation_2']
+
+
+def test_release():
+    path = os.path.join(get_test_data_dir_path(), 'en-de', 'html', 'verb', '44034843.html')
+    with open(path) as f:
+        soup = BeautifulSoup(f, 'lxml')
+    sections = index_sections(soup)
+    etymology, pronunciation = sections[1], sections[2]
+    released = [etymology.node] + list(etymology.siblings())
+    etymology.release(pronunciation.node)
+    assert all(tag.decomposed for tag in released)
+    assert etymology.node not in soup.find_all('h3')
+    assert pronunciation.node.parent is not None
+
+    # a section whose end is not a sibling of its heading is left alone
+    german, verb = sections[0], sections[3]
+    german.release(verb.node.find('span'))
+    assert german.node.parent is not None
+
+
+@pytest.mark.parametrize('lang', ['en-de', 'en-en', 'en-ko'])
+def test_release_keeps_later_sections(lang):
+    # extracting each section before the previous ones are released gives the same entries
+    dispatcher = compile_extractors(get_extractors(lang), get_backend(lang))
+    for path in list_test_data(lang):
+        objs = {}
+        for release in [False, True]:
+            objs[release] = [
+                extract(dispatcher, section) for section in extract_entries(path, dispatcher.backend, release=release)
+            ]
+        assert objs[True] == objs[False]
@@ -0,0 +1,26 @@
+import os
+
+from wiktionary_extractor.extractor import extract_from_path, extract_from_source
+from wiktionary_extractor.shards import ZLIB, ShardReader, pack_directory
+from wiktionary_extractor.test_util import get_test_data_dir_path
+from wiktionary_extractor.util import get_backend, get_extractors
+
+
+def test_pack_and_extract(tmp_path):
+    html_dir = os.path.join(get_test_data_dir_path(), 'en-de', 'html', 'noun')
+    shard_paths = pack_directory(html_dir, str(tmp_path / 'de'), 3, ZLIB)
+    assert len(shard_paths) == 2
+
+    extractors = get_extractors('en-de')
+    backend = get_backend('en-de')
+    names = []
+    for shard_path in shard_paths:
+        with ShardReader(shard_path) as shard:
+            for i in range(len(shard)):
+                name, data = shard.read(i)
+                assert shard.name(i) == name
+                names.append(name)
+                path = os.path.join(html_dir, name)
+                assert extract_from_source(name, data, extractors, backend) == \
+                    extract_from_path((path, extractors, backend))
+    assert names == sorted(os.listdir(html_dir))
@@ -0,0 +1,19 @@
+from bs4 import BeautifulSoup
+
+from wiktionary_extractor.table import Table, Template, read_text
+
+HTML = '''<table>
+<tr><th rowspan="2">infinitive</th><td colspan="2">machen</td></tr>
+<tr><td>a</td><td rowspan="2">b</td></tr>
+<tr><th>x</th><td>c</td></tr>
+</table>'''
+
+
+def test_table():
+    table = Table(BeautifulSoup(HTML, 'html.parser').table)
+    assert len(table) == 3
+    assert table.header(0) == 'infinitive' and table.header(1) is None
+    assert table.cell(1, 1).text == 'b' and table.cell(1, 2) is None
+
+    template = Template([(0, 0, ('INF', ), read_text), (2, 0, ('X', ), read_text), (1, 0, ('A', ), read_text)])
+    assert template.apply(table) == [(('INF', ), 'machen'), (('X', ), 'c'), (('A', ), 'a')]
@@ -0,0 +1,29 @@
+import os
+
+from wiktionary_extractor.test_util import list_test_data
+from wiktionary_extractor.worker import RecyclingPool, extract_batch, init_worker, make_batches
+
+
+def test_recycling_pool(tmp_path):
+    paths = sorted(list_test_data('en-de'))
+    output_dir = str(tmp_path)
+    # every worker is above a 1-byte ceiling after its first batch
+    init_args = ('en-de', None, None, False, None, 1, output_dir, False, 'on', 'read')
+    pool = RecyclingPool(2, initializer=init_worker, initargs=init_args)
+    try:
+        results = [result for results, _ in pool.imap(extract_batch, make_batches(paths, 1)) for result in results]
+    finally:
+        pool.close()
+        pool.join()
+
+    assert [task for task, _, _, _ in results] == paths
+    # every worker process opens a part file and is replaced after a single batch
+    parts = [name for name in os.listdir(output_dir) if name.startswith('part-')]
+    assert len(parts) >= len(paths) > 2
+    line_nums = []
+    for name in parts:
+        with open(os.path.join(output_dir, name), 'rb') as f:
+            line_nums.append(len(f.readlines()))
+    assert sum(line_nums) == sum(entry_num for _, entry_num, _, _ in results)
+    # more processes than workers wrote entries
+    assert len([n for n in line_nums if n]) > 2
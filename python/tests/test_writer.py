@@ -0,0 +1,42 @@
+import gzip
+import io
+import json
+
+from wiktionary_extractor.writer import NDJSONWriter, get_resume_path, open_output
+
+
+def test_buffered_until_threshold():
+    stream = io.BytesIO()
+    writer = NDJSONWriter(stream, buffer_size=1 << 20, flush_interval=3600)
+    writer.write(['a', ['a']])
+    assert stream.getvalue() == b''
+    writer.flush()
+    assert stream.getvalue() == b'["a", ["a"]]\n'
+
+
+def test_gzip_output(tmp_path):
+    path = str(tmp_path / 'out.ndjson.gz')
+    objs = [[['Haus', 'noun', [], [], ['house']], ['haus']], [['gut', 'adjective', [], [], ['good']], ['gut']]]
+    with NDJSONWriter(open_output(path), buffer_size=1) as writer:
+        for obj in objs:
+            writer.write(obj)
+    with gzip.open(path, 'rt') as f:
+        assert [json.loads(line) for line in f] == objs
+
+
+def test_resume_path(tmp_path):
+    path = str(tmp_path / 'out.ndjson.gz')
+    assert get_resume_path(path) == path
+    # left unterminated by an interrupted run
+    writer = NDJSONWriter(open_output(path), buffer_size=1)
+    writer.write(['a'])
+    writer.flush()
+    resume_path = get_resume_path(path)
+    assert resume_path == str(tmp_path / 'out.ndjson.1.gz')
+    with NDJSONWriter(open_output(resume_path, append=True)) as resumed:
+        resumed.write(['b'])
+    with gzip.open(resume_path, 'rt') as f:
+        assert [json.loads(line) for line in f] == [['b']]
+    assert get_resume_path(path) == str(tmp_path / 'out.ndjson.2.gz')
+    plain_path = str(tmp_path / 'out.ndjson')
+    assert get_resume_path(plain_path) == plain_path
@@ -0,0 +1,70 @@
+import hashlib
+import importlib
+import json
+import sqlite3
+import zlib
+
+from wiktionary_extractor.entry import Entry, to_json_default
+
+# modules whose code determines the extracted objects, besides the language module itself
+SHARED_MODULES = [
+    'wiktionary_extractor.common',
+    'wiktionary_extractor.lxml_common',
+    'wiktionary_extractor.extractor',
+    'wiktionary_extractor.sections',
+    'wiktionary_extractor.prune',
+    'wiktionary_extractor.table',
+    'wiktionary_extractor.dispatch',
+    'wiktionary_extractor.entry',
+]
+
+
+def get_version(lang_mod):
+    # fingerprint of the extractor code; changing any of these modules invalidates the cache
+    h = hashlib.sha1()
+    for mod in [lang_mod] + [importlib.import_module(name) for name in SHARED_MODULES]:
+        with open(mod.__file__, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class ExtractionCache(object):
+    # extracted objects per page, keyed by (content hash, extractor version) and stored
+    # as zlib-compressed JSON in SQLite; workers open it read-only and the parent writes
+    def __init__(self, path, version, readonly=False):
+        self.version = version
+        if readonly:
+            self.conn = sqlite3.connect('file:{}?mode=ro'.format(path), uri=True)
+        else:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS pages '
+                              '(content_hash TEXT, version TEXT, objs BLOB, PRIMARY KEY (content_hash, version))')
+            self.conn.commit()
+
+    def get(self, content_hash):
+        row = self.conn.execute('SELECT objs FROM pages WHERE content_hash = ? AND version = ?',
+                                (content_hash, self.version)).fetchone()
+        if row is None:
+            return None
+        return [Entry.from_obj(obj) for obj in json.loads(zlib.decompress(row[0]))]
+
+    def put(self, content_hash, objs):
+        blob = zlib.compress(json.dumps(objs, default=to_json_default).encode('utf-8'))
+        self.conn.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?)', (content_hash, self.version, blob))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,65 @@
+import json
+import os
+
+
+def stat_file(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class Checkpoint(object):
+    # append-only manifest of processed files, one JSON object per line;
+    # records are committed one batch per write, and a torn last line is ignored on load
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        self.pending = []
+        if os.path.exists(path):
+            self.load()
+        self.file = open(path, 'a')
+        if self.file.tell() > 0 and not self.ends_with_newline():
+            # terminate a torn record so that it does not swallow the next one
+            self.file.write('\n')
+
+    def load(self):
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # partially written by an interrupted run
+                    continue
+                self.done[record['path']] = record['mtime'], record['size']
+
+    def ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def is_done(self, path, key=None):
+        # `key` identifies a page inside the file at `path`, e.g. a shard record
+        stat = self.done.get(key or os.path.abspath(path))
+        return stat is not None and stat == stat_file(path)
+
+    def add(self, path, entry_num, key=None):
+        mtime, size = stat_file(path)
+        self.pending.append({
+            'path': key or os.path.abspath(path),
+            'mtime': mtime,
+            'size': size,
+            'entries': entry_num,
+        })
+
+    def commit(self):
+        # called once the output of the pending files has been written
+        if not self.pending:
+            return
+        self.file.write(''.join(json.dumps(record) + '\n' for record in self.pending))
+        self.file.flush()
+        for record in self.pending:
+            self.done[record['path']] = record['mtime'], record['size']
+        self.pending = []
+
+    def close(self):
+        self.commit()
+        self.file.close()
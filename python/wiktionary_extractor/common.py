@@ -1,36 +1,42 @@
 import logging
 
+# definitions having a direct <span> of these classes are variants, not meanings
+SKIPPED_DEFINITION_CLASSES = frozenset(['form-of-definition', 'use-with-mention'])
+# nested lists of a definition are long descriptions or examples
+LONG_DESCRIPTION_NAMES = frozenset(['ul', 'ol', 'dl'])
 
-def get_next(tag, name, prev=False):
+
+def get_next(tag, name, prev=False, end=None):
+    # search stops at `end` (exclusive), e.g. the heading closing the current section
     tag = tag.next_sibling if not prev else tag.previous_sibling
-    while tag is not None and getattr(tag, 'name', None) != name:
+    while tag is not None and tag is not end and getattr(tag, 'name', None) != name:
         if prev:
             tag = tag.previous_sibling
         else:
             tag = tag.next_sibling
+    if tag is end:
+        return None
     return tag
 
 
-def extract_tables(node):
-    div = node
-    while True:
-        div = get_next(div, 'div')
-        if div is None:
-            break
-        if 'NavFrame' in div.get('class'):
+def extract_tables(section):
+    for div in section.siblings():
+        if getattr(div, 'name', None) != 'div':
+            continue
+        if 'NavFrame' in div.get('class', []):
             head = div.div.text.strip()
             table = div.table
             yield head, table
 
 
-def default_extractor_parse_variants(node, extract_attrs=None):
+def default_extractor_parse_variants(section, extract_attrs=None):
     return default_extractor(
-        node, parse_variants=True, extract_attrs=extract_attrs)
+        section, parse_variants=True, extract_attrs=extract_attrs)
 
 
-def default_extractor(node, parse_variants=False, extract_attrs=None):
+def default_extractor(section, parse_variants=False, extract_attrs=None):
     # parse form
-    p = get_next(node, 'p')
+    p = get_next(section.node, 'p', end=section.end)
     from_elt = p.find('strong')
     if not from_elt:
         # sometimes headword is tagged by <b>
@@ -68,34 +74,19 @@ def default_extractor(node, parse_variants=False, extract_attrs=None):
 
     # parse definitions
     definitions = []
-    ol = get_next(p, 'ol')
+    ol = get_next(p, 'ol', end=section.end)
     if not ol:
-        ol = get_next(p, 'ul')
+        ol = get_next(p, 'ul', end=section.end)
+    if not ol:
+        return None
     for li in ol.find_all('li', recursive=False):
-        # remove untranslated definition
-        if li.find('a', text='rfdef'):
-            continue
-
-        # skip variants
-        skip = False
-        for span in li.find_all('span', recursive=False):
-            if span.has_attr("class") and span['class']:
-                if 'form-of-definition' in span['class']:
-                    skip = True
-                    break
-                if 'use-with-mention' in span['class']:
-                    skip = True
-                    break
-        if skip:
+        long_descriptions = scan_definition(li)
+        if long_descriptions is None:
             continue
 
         # remove long description
-        for ul in li.find_all('ul'):
-            ul.extract()
-        for ol in li.find_all('ol'):
-            ol.extract()
-        for dl in li.find_all('dl'):
-            dl.extract()
+        for e in long_descriptions:
+            e.extract()
 
         definition = li.text.strip()
         assert '\n' not in definition, definition
@@ -113,6 +104,27 @@ def default_extractor(node, parse_variants=False, extract_attrs=None):
         return None
 
 
+def scan_definition(li):
+    # one pass over a definition item: returns the long descriptions to be removed from it,
+    # or None if the item is to be skipped
+    long_descriptions = []
+    for tag in li.descendants:
+        name = tag.name
+        if name is None:
+            continue
+        elif name == 'a':
+            # untranslated definition
+            if tag.string == 'rfdef':
+                return None
+        elif name == 'span':
+            # variant
+            if tag.parent is li and not SKIPPED_DEFINITION_CLASSES.isdisjoint(tag.get('class') or ()):
+                return None
+        elif name in LONG_DESCRIPTION_NAMES:
+            long_descriptions.append(tag)
+    return long_descriptions
+
+
 def filter_variants(variants, supported_variants):
     new_variants = []
     for variant_type, variant_form in variants:
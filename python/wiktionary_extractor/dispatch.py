@@ -0,0 +1,97 @@
+import re
+from collections import Counter
+
+from wiktionary_extractor import lxml_common
+from wiktionary_extractor.common import default_extractor
+from wiktionary_extractor.prune import DEFAULT_PRUNED_CLASSES, Pruner
+
+DEFAULT_BACKEND = 'bs4'
+
+DEFAULT_EXTRACTORS = {
+    'bs4': default_extractor,
+    'lxml': lxml_common.default_extractor,
+}
+
+# marks the end of an extractor name in the trie
+END = None
+
+# prefilter modes: skip pages without a candidate headline, never skip, or extract every page
+# and report those which would have been skipped wrongly
+PREFILTER_MODES = ['on', 'off', 'verify']
+# characters whose escaping in HTML the prefilter does not try to follow
+UNSAFE_NAME_CHARS = set('&<>"\'')
+
+
+def compile_prefilter(names):
+    # a byte pattern finding a mw-headline span whose text may start with one of `names`,
+    # possibly inside inline tags; None if no such pattern is safe, e.g. for an empty name
+    if not names:
+        return None
+    for name in names:
+        if not name or not name.isascii() or UNSAFE_NAME_CHARS.intersection(name):
+            return None
+    alternatives = b'|'.join(re.escape(name.encode('ascii')) for name in sorted(names, key=len, reverse=True))
+    return re.compile(b'mw-headline[^>]*>(?:<[^>]*>)*(?:' + alternatives + b')')
+
+
+class Dispatcher(object):
+    # an extractor table compiled into a prefix trie: every extractor whose name is a prefix
+    # of a headline applies to it, in the order of the original table
+    def __init__(self, extractors, backend=DEFAULT_BACKEND, prefilter='on', pruned_classes=DEFAULT_PRUNED_CLASSES):
+        self.backend = backend
+        # regions left out of the parsed pages; None to parse them whole
+        self.pruner = Pruner(pruned_classes) if pruned_classes is not None else None
+        self.prefilter = compile_prefilter(list(extractors)) if prefilter != 'off' else None
+        self.verify_prefilter = prefilter == 'verify'
+        # pages 'skipped' by the prefilter, and in verify mode those 'missed' (skipped but with entries)
+        self.prefiltered = Counter()
+        self.trie = {}
+        for index, (name, pos_extractor) in enumerate(extractors.items()):
+            if isinstance(pos_extractor, str):
+                pos, extractor = pos_extractor, DEFAULT_EXTRACTORS[backend]
+            else:
+                pos, extractor = pos_extractor
+            node = self.trie
+            for c in name:
+                node = node.setdefault(c, {})
+            node.setdefault(END, []).append((index, pos, extractor))
+        self.cache = {}
+        self.unmatched = Counter()
+
+    def lookup(self, headline):
+        # returns [(pos, extractor), ...]
+        matches = self.cache.get(headline)
+        if matches is None:
+            matches = []
+            node = self.trie
+            matches.extend(node.get(END, []))
+            for c in headline:
+                node = node.get(c)
+                if node is None:
+                    break
+                matches.extend(node.get(END, []))
+            matches = [(pos, extractor) for _, pos, extractor in sorted(matches, key=lambda m: m[0])]
+            self.cache[headline] = matches
+        if not matches:
+            self.unmatched[headline] += 1
+        return matches
+
+    def may_match(self, data):
+        # False only if no headline of the page (bytes) can have an extractor
+        return self.prefilter is None or self.prefilter.search(data) is not None
+
+    def pop_prefiltered(self):
+        prefiltered = self.prefiltered
+        self.prefiltered = Counter()
+        return prefiltered
+
+    def pop_unmatched(self):
+        unmatched = self.unmatched
+        self.unmatched = Counter()
+        return unmatched
+
+
+def compile_extractors(extractors, backend=DEFAULT_BACKEND):
+    if isinstance(extractors, Dispatcher):
+        return extractors
+    return Dispatcher(extractors, backend)
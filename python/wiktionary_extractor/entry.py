@@ -0,0 +1,86 @@
+import sys
+from functools import total_ordering
+
+
+def canonical_variant(variant):
+    # hashable (types, form); tuple types pass through tuple() unchanged, and
+    # interned forms make the set lookups in remove_duplicates pointer compares
+    types, form = variant
+    if not isinstance(types, str):
+        types = tuple(types)
+    return types, sys.intern(form)
+
+
+@total_ordering
+class Entry(object):
+    # immutable extracted entry; variants are (types, form) with a tuple of types
+    # (or a plain string for unfiltered variants), and the sort key and hash are computed once
+    __slots__ = ('lemma', 'pos', 'attrs', 'variants', 'defs', '_key', '_hash')
+
+    def __init__(self, lemma, pos, attrs, variants, defs):
+        attrs = tuple(attrs)
+        variants = tuple(map(canonical_variant, variants))
+        defs = tuple(defs)
+        key = (lemma, pos, attrs, variants, defs)
+        for name, value in zip(self.__slots__, key + (key, hash(key))):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_obj(cls, obj):
+        # from [lemma, pos, attrs, variants, defs], e.g. decoded from JSON
+        return cls(*obj)
+
+    def to_obj(self):
+        return [self.lemma, self.pos, list(self.attrs), [[types, form] for types, form in self.variants],
+                list(self.defs)]
+
+    def convert(self):
+        return {
+            'lemma': self.lemma,
+            'pos': self.pos,
+            'attrs': list(self.attrs),
+            'variants': [{
+                'type': k,
+                'form': v
+            } for k, v in self.variants],
+            'defs': list(self.defs),
+        }
+
+    @classmethod
+    def deconvert(cls, obj):
+        variants = [(item['type'], item['form']) for item in obj['variants']]
+        return cls(obj['lemma'], obj['pos'], obj['attrs'], variants, obj['defs'])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Entry is immutable')
+
+    def __reduce__(self):
+        return Entry, self._key
+
+    def __iter__(self):
+        # unpacks like [lemma, pos, attrs, variants, defs]
+        return iter(self._key)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Entry):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __lt__(self, other):
+        return self._key < other._key
+
+    def __repr__(self):
+        return 'Entry{!r}'.format(self._key)
+
+
+def to_json_default(obj):
+    # `default` hook of the JSON encoders
+    if isinstance(obj, Entry):
+        return obj.to_obj()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
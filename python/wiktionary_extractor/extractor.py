@@ -3,75 +3,117 @@ import traceback
 
 from bs4 import BeautifulSoup
 
-from wiktionary_extractor.common import default_extractor
+from wiktionary_extractor import lxml_common
+from wiktionary_extractor.dispatch import DEFAULT_BACKEND, compile_extractors
+from wiktionary_extractor.entry import Entry, canonical_variant
+from wiktionary_extractor.prune import GARBAGE_CLASSES, PruningTreeBuilder
+from wiktionary_extractor.sections import index_sections
+
+GARBAGE_NAMES = list(GARBAGE_CLASSES)
 
 
 def extract_from_path(args):
-    path, extractors = args
-    objs = []
-    for headline, node in extract_entries(path):
+    path, extractors, backend = args
+    return extract_from_source(path, path, extractors, backend)
+
+
+def extract_from_source(name, source, extractors, backend=DEFAULT_BACKEND, profile=None):
+    return list(iter_extract_from_source(name, source, extractors, backend, profile))
+
+
+def iter_extract_from_source(name, source, extractors, backend=DEFAULT_BACKEND, profile=None):
+    # `extractors` is an extractor table or a `Dispatcher` compiled from one
+    dispatcher = compile_extractors(extractors, backend)
+    skipped = False
+    source = read_source(source)
+    if dispatcher.prefilter is not None and not dispatcher.may_match(source):
+        dispatcher.prefiltered['skipped'] += 1
+        if not dispatcher.verify_prefilter:
+            return
+        skipped = True
+    # a mapped page is copied only now that it is going to be parsed
+    source = bytes(source)
+    for section in extract_entries(source, dispatcher.backend, release=True, pruner=dispatcher.pruner):
         try:
-            new_objs = extract(extractors, headline, node)
-            objs.extend(new_objs)
+            new_objs = extract(dispatcher, section, profile)
         except Exception as ex:
-            print('Error: {}\t{}'.format(path, headline), file=sys.stderr)
+            print('Error: {}\t{}'.format(name, section.headline), file=sys.stderr)
             print(ex, file=sys.stderr)
             print(traceback.format_exc(), file=sys.stderr)
-    return objs
+            continue
+        if skipped and new_objs:
+            print('Prefilter would have dropped: {}\t{}'.format(name, section.headline), file=sys.stderr)
+            dispatcher.prefiltered['missed'] += 1
+            skipped = False
+        yield from new_objs
+
 
+def read_source(source):
+    # a path is read in bulk; bytes and mapped pages are used as they are
+    if not isinstance(source, str):
+        return source
+    with open(source, 'rb') as f:
+        return f.read()
 
-def extract_entries(path):
-    with open(path) as f:
-        soup = BeautifulSoup(f, 'lxml')
-        clean(soup)
-        for child in soup.recursiveChildGenerator():
-            name = getattr(child, 'name', None)
-            if name is not None:
-                if name.startswith('h'):
-                    headline = get_headline(child)
-                    if headline:
-                        yield headline, child
+
+def extract_entries(source, backend=DEFAULT_BACKEND, release=False, pruner=None):
+    # `source` is a path, or the page itself as UTF-8 bytes;
+    # with `release`, each section is freed once the next one is requested
+    parse, clean, index_sections = get_stages(backend)
+    root = parse(source, pruner)
+    clean(root)
+    sections = index_sections(root)
+    for i, section in enumerate(sections):
+        yield section
+        if release:
+            next_section = sections[i + 1] if i + 1 < len(sections) else None
+            section.release(next_section and next_section.node)
+    if release and backend != 'lxml':
+        # break the reference cycles of the soup instead of leaving them to the garbage collector
+        root.decompose()
+
+
+def get_stages(backend):
+    # (parse, clean, index_sections) of a backend
+    if backend == 'lxml':
+        return lxml_common.parse, lxml_common.clean, lxml_common.index_sections
+    return parse, clean, index_sections
+
+
+def parse(source, pruner=None):
+    # with a `prune.Pruner`, the regions it selects are not built at all
+    # pages are UTF-8, which is declared instead of being sniffed (or taken from the locale)
+    features, builder = ('lxml', None) if pruner is None else (None, PruningTreeBuilder(pruner))
+    return BeautifulSoup(bytes(read_source(source)), features, builder=builder, from_encoding='utf-8')
 
 
 def remove_duplicates(lst):
     res = []
-    # filter out duplicates
-    hs = set()
-    for e in lst:
-        h = str(e)
-        if h not in hs:
-            hs.add(h)
+    # filter out duplicates, keeping the first occurrence
+    seen = set()
+    for e in map(canonical_variant, lst):
+        if e not in seen:
+            seen.add(e)
             res.append(e)
     return res
 
 
-def extract(extractors, headline, node):
+def extract(dispatcher, section, profile=None):
     objs = []
-    for name, pos_extractor in extractors.items():
-        if isinstance(pos_extractor, str):
-            pos, extractor = pos_extractor, default_extractor
+    for pos, extractor in dispatcher.lookup(section.headline):
+        if profile:
+            obj = profile.call(pos, extractor, section)
         else:
-            pos, extractor = pos_extractor
-        if headline.startswith(name):
-            obj = extractor(node)
-            if obj:
-                form, attrs, variants, definitions = obj
-                variants = remove_duplicates(variants)
-                obj = [form, pos, attrs, variants, definitions]
-                objs.append(obj)
+            obj = extractor(section)
+        if obj:
+            form, attrs, variants, definitions = obj
+            variants = remove_duplicates(variants)
+            objs.append(Entry(form, pos, attrs, variants, definitions))
     return objs
 
 
-def get_headline(node):
-    span = node.find('span', {'class', 'mw-headline'})
-    if span:
-        return span.text
-    else:
-        return None
-
-
 def clean(root):
-    for e in root.find_all('div', {'class', 'floatright'}):
-        e.extract()
-    for e in root.find_all('span', {'class', 'maintenance-line'}):
-        e.extract()
+    # one pass over the document for both kinds of garbage
+    for e in root.find_all(GARBAGE_NAMES):
+        if not GARBAGE_CLASSES[e.name].isdisjoint(e.get('class') or ()):
+            e.extract()
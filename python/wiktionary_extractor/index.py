@@ -0,0 +1,226 @@
+# On-disk lookup index over the `[entry, keys]` lines written by main.py.
+#
+# <prefix>.data holds one JSON entry per line; <prefix>.index maps every key to the
+# offsets of its entries in the data file:
+#
+#   magic | key bytes* | posting (u64 entry offset)* | key record* | footer
+#
+# where a key record is `<key offset u64><key length u32><postings offset u64><posting count u32>`,
+# records are sorted by the UTF-8 bytes of the key, and the footer is
+# `<key table offset u64><key count u32><magic>`. Both files are memory-mapped when read,
+# and a lookup is a binary search over the key records.
+#
+# The postings are sorted externally, like the lines of merge.py: runs of at most `run_size`
+# postings are sorted in memory and spilled to temporary files, then k-way merged, and the
+# index is written from the merged stream.
+import gzip
+import heapq
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+from wiktionary_extractor.entry import Entry
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'WXINDEX1'
+DATA_EXTENSION = '.data'
+INDEX_EXTENSION = '.index'
+KEY_RECORD = struct.Struct('<QIQI')
+POSTING = struct.Struct('<Q')
+FOOTER = struct.Struct('<QI8s')
+# posting in a run file: `<key length u32><entry offset u64>` and the key bytes
+RUN_POSTING = struct.Struct('<IQ')
+DEFAULT_RUN_SIZE = 1 << 20
+
+
+def get_keys(entry):
+    lemma, _, _, variants, _ = entry
+    keys = [lemma] + [form for _, form in variants]
+    return [key.lower() for key in keys]
+
+
+def normalize_key(form):
+    return form.lower().encode('utf-8')
+
+
+def open_input(path):
+    if path == '-':
+        return sys.stdin.buffer
+    elif path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    elif path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read ' + path)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    else:
+        return open(path, 'rb')
+
+
+def build_index(paths, dst_prefix, run_size=DEFAULT_RUN_SIZE, tmp_dir=None):
+    # reads `[entry, keys]` lines from `paths` and returns the number of entries indexed
+    entry_num = 0
+    data_path = dst_prefix + DATA_EXTENSION
+    tmp_path = data_path + '.tmp'
+    with tempfile.TemporaryDirectory(prefix='index-', dir=tmp_dir) as run_dir:
+        run = set()
+        run_paths = []
+        with open(tmp_path, 'wb') as data:
+            for path in paths:
+                f = open_input(path)
+                try:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        obj, keys = json.loads(line)
+                        offset = data.tell()
+                        entry_num += 1
+                        data.write(json.dumps(obj, ensure_ascii=False).encode('utf-8'))
+                        data.write(b'\n')
+                        for key in keys:
+                            run.add((normalize_key(key), offset))
+                        if len(run) >= run_size:
+                            run_paths.append(write_run(run, run_dir))
+                            run = set()
+                finally:
+                    if f is not sys.stdin.buffer:
+                        f.close()
+        if run:
+            run_paths.append(write_run(run, run_dir))
+        os.replace(tmp_path, data_path)
+
+        write_index(dst_prefix + INDEX_EXTENSION, heapq.merge(*map(read_run, run_paths)), run_dir)
+    return entry_num
+
+
+def write_run(postings, tmp_dir):
+    fd, path = tempfile.mkstemp(prefix='run-', suffix='.postings', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        for key, offset in sorted(postings):
+            f.write(RUN_POSTING.pack(len(key), offset))
+            f.write(key)
+    return path
+
+
+def read_run(path):
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(RUN_POSTING.size)
+            if not header:
+                break
+            key_length, offset = RUN_POSTING.unpack(header)
+            yield f.read(key_length), offset
+
+
+def write_index(path, postings, tmp_dir=None):
+    # `postings` are (key bytes, entry offset) pairs sorted by key, possibly repeated; the key
+    # bytes go to the index right away, while the postings and the key records (whose posting
+    # offsets are relative until the size of the keys is known) are spilled and appended after
+    tmp_path = path + '.tmp'
+    key_num = 0
+    with open(tmp_path, 'wb') as f, tempfile.TemporaryFile(dir=tmp_dir) as offsets, \
+            tempfile.TemporaryFile(dir=tmp_dir) as records:
+        f.write(MAGIC)
+        posting_num = 0
+        last = None
+        # key offset, key length and first posting of the current key
+        current = None
+        for posting in postings:
+            if posting == last:
+                continue
+            key, offset = posting
+            if last is None or key != last[0]:
+                if current is not None:
+                    records.write(KEY_RECORD.pack(*current, posting_num - current[2]))
+                current = f.tell(), len(key), posting_num
+                key_num += 1
+                f.write(key)
+            offsets.write(POSTING.pack(offset))
+            posting_num += 1
+            last = posting
+        if current is not None:
+            records.write(KEY_RECORD.pack(*current, posting_num - current[2]))
+
+        postings_offset = f.tell()
+        offsets.seek(0)
+        shutil.copyfileobj(offsets, f)
+        table_offset = f.tell()
+        records.seek(0)
+        while True:
+            chunk = records.read(KEY_RECORD.size * 4096)
+            if not chunk:
+                break
+            f.write(b''.join(
+                KEY_RECORD.pack(key_offset, key_length, postings_offset + first * POSTING.size, count)
+                for key_offset, key_length, first, count in KEY_RECORD.iter_unpack(chunk)))
+        f.write(FOOTER.pack(table_offset, key_num, MAGIC))
+    os.replace(tmp_path, path)
+
+
+def map_file(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class IndexReader(object):
+    def __init__(self, prefix):
+        self.index = map_file(prefix + INDEX_EXTENSION)
+        self.data = map_file(prefix + DATA_EXTENSION)
+        self.table_offset, self.count, magic = FOOTER.unpack_from(self.index, len(self.index) - FOOTER.size)
+        if self.index[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            raise ValueError('Not an index: ' + prefix + INDEX_EXTENSION)
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i):
+        return KEY_RECORD.unpack_from(self.index, self.table_offset + i * KEY_RECORD.size)
+
+    def _find(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_offset, key_length, postings_offset, posting_num = self._record(mid)
+            k = self.index[key_offset:key_offset + key_length]
+            if k < key:
+                lo = mid + 1
+            elif k > key:
+                hi = mid
+            else:
+                return postings_offset, posting_num
+        return None
+
+    def offsets(self, form):
+        found = self._find(normalize_key(form))
+        if found is None:
+            return []
+        postings_offset, posting_num = found
+        return [POSTING.unpack_from(self.index, postings_offset + i * POSTING.size)[0] for i in range(posting_num)]
+
+    def read(self, offset):
+        end = self.data.find(b'\n', offset)
+        return Entry.from_obj(json.loads(self.data[offset:end]))
+
+    def lookup(self, form):
+        # entries whose lemma or one of its variants is `form`, case-insensitively
+        return [self.read(offset) for offset in self.offsets(form)]
+
+    def close(self):
+        for buf in (self.index, self.data):
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
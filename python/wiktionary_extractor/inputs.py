@@ -0,0 +1,222 @@
+# Where pages come from: plain or compressed files, shards, .zip or .tar archives read in
+# place, and streams of rendered pages (stdin or a named pipe). Pages are always handed on as
+# undecoded bytes, which the parsers read as UTF-8.
+#
+# A task (the unit sent to a worker) is one of
+#   path                          a page, possibly compressed as .gz or .zst
+#   (shard path, record index)    a page of a shard
+#   (zip path, member name)       a page of a .zip archive, read by the worker
+#   (tar path, member name, page) a page of a tar archive, read by the parent since tar
+#                                 archives (compressed ones in particular) can only be streamed
+#   (stream path, name, page)     a page of a stream, likewise
+#
+# A stream has one JSON object per line, {"oldid": ..., "title": ..., "html": ...}, as written by
+# the downloader with -stream.
+import gzip
+import json
+import mmap
+import os
+import queue
+import stat
+import sys
+import tarfile
+import threading
+import zipfile
+
+from wiktionary_extractor.shards import ShardReader, is_shard
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 'read' copies a page into memory with one read(); 'mmap' maps it, and only pages which pass
+# the prefilter are copied
+READ_MODES = ['read', 'mmap']
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst')
+STDIN = '-'
+# in the tasks of a stream: nothing more is ready yet, so a partial batch should be sent
+FLUSH = object()
+# end of the records read by a `StreamReader`
+END = object()
+# seconds between checks whether a `StreamReader` was closed
+POLL_INTERVAL = 0.1
+
+# archives stay open for the lifetime of the process
+_archives = {}
+
+
+def is_zip(path):
+    return path.endswith('.zip')
+
+
+def is_tar(path):
+    return path.endswith(TAR_EXTENSIONS)
+
+
+def is_stream(path):
+    # stdin or a named pipe, which can be read only once; only checked on the roots of a run,
+    # so that page files are not stat'ed for it
+    if path == STDIN:
+        return True
+    try:
+        return stat.S_ISFIFO(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def decompress_zstd(data):
+    if zstandard is None:
+        raise RuntimeError('zstandard is required to read .zst pages')
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def read_file(path, read_mode='read'):
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    with open(path, 'rb') as f:
+        if path.endswith('.zst'):
+            return decompress_zstd(f.read())
+        if read_mode == 'mmap' and os.fstat(f.fileno()).st_size > 0:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+
+def open_tar(path):
+    if path.endswith('.tar.zst'):
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read ' + path)
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return tarfile.open(fileobj=stream, mode='r|')
+    # transparent compression, streamed
+    return tarfile.open(path, mode='r|*')
+
+
+def iter_tar(path):
+    # (name, page) of the regular files of a tar archive, in archive order
+    with open_tar(path) as tar:
+        for info in tar:
+            if info.isfile():
+                yield info.name, tar.extractfile(info).read()
+
+
+def iter_stream(f):
+    # (name, page) of the records of a stream as they arrive
+    for line in f:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # torn by a producer which was interrupted
+            print('Invalid record skipped: {!r}'.format(line[:80]), file=sys.stderr)
+            continue
+        yield '{}.html'.format(record['oldid']), record['html'].encode('utf-8')
+
+
+class StreamReader(object):
+    # the tasks of a stream (see `is_stream`), read in a daemon thread into a queue of at most
+    # `size` records, so that a read blocked on the producer never holds up the end of a run;
+    # FLUSH is yielded whenever no record is ready, so that the records read so far are sent
+    def __init__(self, path, size=16):
+        self.path = path
+        self.queue = queue.Queue(size)
+        self.closed = False
+        self.error = None
+        self.thread = threading.Thread(target=self.read, daemon=True)
+        self.thread.start()
+
+    def read(self):
+        try:
+            if self.path == STDIN:
+                self.put_records(sys.stdin.buffer)
+            else:
+                with open(self.path, 'rb') as f:
+                    self.put_records(f)
+        except Exception as ex:
+            # raised again by the consumer
+            self.error = ex
+        finally:
+            self.put(END)
+
+    def put_records(self, f):
+        for name, page in iter_stream(f):
+            if not self.put((self.path, name, page)):
+                return
+
+    def put(self, item):
+        # False once the reader is closed
+        while not self.closed:
+            try:
+                self.queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self):
+        while not self.closed:
+            try:
+                return self.queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return END
+
+    def __iter__(self):
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                yield FLUSH
+                item = self.get()
+            if item is END:
+                break
+            yield item
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        # the records not consumed yet are abandoned, and so is the thread if it is blocked
+        # on the producer
+        self.closed = True
+
+
+def expand(path):
+    # the tasks of an input path other than a stream
+    if is_shard(path):
+        with ShardReader(path) as shard:
+            for i in range(len(shard)):
+                yield path, i
+    elif is_zip(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield path, info.filename
+    elif is_tar(path):
+        for name, page in iter_tar(path):
+            yield path, name, page
+    else:
+        yield path
+
+
+def get_archive(path):
+    if path not in _archives:
+        _archives[path] = ShardReader(path) if is_shard(path) else zipfile.ZipFile(path)
+    return _archives[path]
+
+
+def get_task_id(task):
+    # the task without the page it carries, to identify it in the parent
+    return task[:2] if isinstance(task, tuple) else task
+
+
+def load(task, read_mode='read'):
+    # returns the name of the page and the page (bytes, or an mmap in 'mmap' mode)
+    if not isinstance(task, tuple):
+        return task, read_file(task, read_mode)
+    if len(task) == 3:
+        _, name, page = task
+        return name, page
+    path, member = task
+    if is_shard(path):
+        return get_archive(path).read(member)
+    return member, get_archive(path).read(member)
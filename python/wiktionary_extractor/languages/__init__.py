@@ -1,7 +1,57 @@
-from os.path import dirname, basename, isfile
-import glob
-modules = glob.glob(dirname(__file__) + "/*.py")
-__all__ = [
-    basename(f)[:-3] for f in modules
-    if isfile(f) and not f.endswith('__init__.py')
-]
+# Registry of language modules, imported on first use so that a run (and each of its
+# workers) only pays for the language it extracts.
+#
+# A language is a module of this package named after it (en-de -> en_de), or a module
+# registered by another distribution under the `wiktionary_extractor.languages` entry point
+# group, e.g. in its setup.py:
+#
+#   entry_points={'wiktionary_extractor.languages': ['en-fr = my_package.en_fr']}
+import importlib
+
+ENTRY_POINT_GROUP = 'wiktionary_extractor.languages'
+
+_modules = {}
+
+
+def get_module_name(lang):
+    return lang.replace('-', '_')
+
+
+def iter_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return eps.select(group=ENTRY_POINT_GROUP)
+    return eps.get(ENTRY_POINT_GROUP, [])
+
+
+def list_languages():
+    # only needed for error messages; pkgutil is slow to import
+    import pkgutil
+    names = {name for _, name, _ in pkgutil.iter_modules(__path__)}
+    names.update(get_module_name(ep.name) for ep in iter_entry_points())
+    return sorted(names)
+
+
+def load_module(name):
+    qualified_name = __name__ + '.' + name
+    try:
+        return importlib.import_module(qualified_name)
+    except ModuleNotFoundError as e:
+        # only a missing language falls through to the plugins, not a missing dependency of one
+        if e.name != qualified_name:
+            raise
+    for ep in iter_entry_points():
+        if get_module_name(ep.name) == name:
+            return ep.load()
+    raise ValueError('Unknown language: {} (available: {})'.format(name, ', '.join(list_languages())))
+
+
+def get_module(lang):
+    name = get_module_name(lang)
+    if name not in _modules:
+        _modules[name] = load_module(name)
+    return _modules[name]
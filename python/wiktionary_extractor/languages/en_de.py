@@ -1,5 +1,5 @@
-from wiktionary_extractor.common import default_extractor, get_next, extract_tables, filter_variants, \
-    get_th
+from wiktionary_extractor.common import default_extractor, get_next, extract_tables, filter_variants
+from wiktionary_extractor.table import Table, Template, first, read_text
 
 # noun
 GENITIVE = 'GEN'
@@ -28,8 +28,8 @@ PERSON_2_PLURAL = '2p'
 PERSON_3_PLURAL = '3p'
 
 
-def noun_extractor(node):
-    obj = default_extractor(node, True)
+def noun_extractor(section):
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
@@ -37,40 +37,40 @@ def noun_extractor(node):
     variants = filter_variants(
         variants,
         {
-            "genitive": [],
-            "plural": [],
-            "diminutive": [DIMINUTIVE],
-            #"feminine": [FEMININE],
+            "genitive": (),
+            "plural": (),
+            "diminutive": (DIMINUTIVE,),
+            #"feminine": (FEMININE,),
         })
 
-    for head, table in extract_tables(node):
+    for head, table in extract_tables(section):
         if head.startswith('Declension of'):
-            variants.extend(get_all_cells([], table, True))
+            variants.extend(get_all_cells((), table, True))
 
-    variants.append(([], form))
+    variants.append(((), form))
 
     return form, attrs, variants, definitions
 
 
-def adjective_extractor(node):
-    obj = default_extractor(node, True)
+def adjective_extractor(section):
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
 
     variants = filter_variants(variants, {
-        'superlative': [SUPERLATIVE],
-        'comparative': [COMPARATIVE],
+        'superlative': (SUPERLATIVE,),
+        'comparative': (COMPARATIVE,),
     })
-    variants.append(([], form))
+    variants.append(((), form))
 
-    for head, table in extract_tables(node):
+    for head, table in extract_tables(section):
         if head.startswith('Positive forms of'):
-            variants.extend(get_all_cells([], table))
+            variants.extend(get_all_cells((), table))
         elif head.startswith('Comparative forms of'):
-            variants.extend(get_all_cells([COMPARATIVE], table))
+            variants.extend(get_all_cells((COMPARATIVE,), table))
         elif head.startswith('Superlative forms of'):
-            variants.extend(get_all_cells([SUPERLATIVE], table))
+            variants.extend(get_all_cells((SUPERLATIVE,), table))
 
     return form, attrs, variants, definitions
 
@@ -86,9 +86,9 @@ def get_all_cells(t, table, span=False):
     return res
 
 
-def verb_extractor(node):
+def verb_extractor(section):
     # Note: variants are not parsed here, since 'form-of' class is missing
-    obj = default_extractor(node, True)
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, _, definitions = obj
@@ -96,7 +96,7 @@ def verb_extractor(node):
     conjugations = []
     if definitions:
         # parse conjugation table
-        for head, table in extract_tables(node):
+        for head, table in extract_tables(section):
             new_conjugations = []
             if head.lower().startswith('conjugation of'):
                 # lower-case match because {{de-conj-auto}} uses lower-cased title
@@ -118,26 +118,18 @@ def verb_extractor(node):
     return form, attrs, conjugations, definitions
 
 
-def get_cell(trs, i, j, direct=False):
-    tds = trs[i].find_all('td')
-    res = []
-    td = tds[j]
-    if direct:
-        res.append(td.text.strip())
-    else:
-        # try to find <span> first
-        # if not found, use <a>
-        tags = td.find_all('span', {'class', 'Latn'})
-        if not tags:
-            tags = td.find_all('a')
-        for tag in tags:
-            res.append(tag.text.strip())
-    return res
+def read_latin(td):
+    # try to find <span> first
+    # if not found, use <a>
+    tags = td.find_all('span', {'class', 'Latn'})
+    if not tags:
+        tags = td.find_all('a')
+    return [tag.text.strip() for tag in tags]
 
 
 def get_separable_form(conjugations):
     for t, form in conjugations:
-        if t == [PRESENT, PERSON_3_PLURAL]:
+        if t == (PRESENT, PERSON_3_PLURAL):
             verb, prefix = form.split()
             return prefix + '|' + verb
     assert False, 'present 3rd person plural not found'
@@ -147,9 +139,9 @@ def get_participles(conjugations):
     pp = None
     presp = None
     for t, form in conjugations:
-        if t == [PAST_PARTICIPLE]:
+        if t == (PAST_PARTICIPLE,):
             pp = form
-        elif t == [PRESENT_PARTICIPLE]:
+        elif t == (PRESENT_PARTICIPLE,):
             presp = form
     if not pp or not presp:
         assert False, ('participle not found', pp, presp)
@@ -157,77 +149,58 @@ def get_participles(conjugations):
 
 
 def get_declension_of_participle(p, t):
-    return [([t], p + suffix) for suffix in ['e', 'em', 'en', 'er', 'es']]
+    return [((t,), p + suffix) for suffix in ['e', 'em', 'en', 'er', 'es']]
+
+
+def get_person_cells(i, j, types):
+    # three rows of singular and plural persons, the first form of each
+    persons = [
+        PERSON_1_SINGULAR, PERSON_2_SINGULAR, PERSON_3_SINGULAR,
+        PERSON_1_PLURAL, PERSON_2_PLURAL, PERSON_3_PLURAL
+    ]
+    cells = []
+    for di in range(3):
+        cells.append((i + di, j, types + (persons[di],), first(read_latin)))
+        cells.append((i + di, j + 1, types + (persons[di + 3],), first(read_latin)))
+    return cells
+
+
+def compile_conjugation_template(separable):
+    # separable verbs have an extra zu-infinitive row
+    off = 1 if separable else 0
+    cells = []
+    if separable:
+        cells.append((3, 0, (ZU_INFINITIVE,), read_latin))
+    cells.append((0, 0, (INFINITIVE,), first(read_text)))
+    cells.append((1, 0, (PRESENT_PARTICIPLE,), read_latin))
+    cells.append((2, 0, (PAST_PARTICIPLE,), read_latin))
+    cells.extend(get_person_cells(off + 5, 0, (PRESENT,)))
+    cells.extend(get_person_cells(off + 9, 0, (PRETERITE,)))
+    cells.extend(get_person_cells(off + 5, 1, (SUBJUNCTIVE_I,)))
+    cells.extend(get_person_cells(off + 9, 1, (SUBJUNCTIVE_II,)))
+    cells.append((off + 13, 0, (IMPERATIVE,), read_latin))
+    cells.append((off + 13, 1, (IMPERATIVE,), read_latin))
+    return Template(cells)
+
+
+CONJUGATION_TEMPLATES = {separable: compile_conjugation_template(separable) for separable in (False, True)}
+
+SUBORDINATE_CONJUGATION_TEMPLATE = Template(
+    get_person_cells(1, 0, (PRESENT,)) + get_person_cells(5, 0, (PRETERITE,)) +
+    get_person_cells(1, 1, (SUBJUNCTIVE_I,)) + get_person_cells(5, 1, (SUBJUNCTIVE_II,)))
 
 
 def parse_conjugation_table(table):
-    res = []
-    trs = table.find_all('tr')
-    tag = 'a'
-    separable = False
-
-    def _g(i, j, types):
-        for item in get_cell(trs, i, j):
-            res.append((types, item))
-
-    off = 0
-    if get_th(trs, 3, 0) == 'zu-infinitive':
-        separable = True
-        off = 1
-        _g(3, 0, [ZU_INFINITIVE])
-
-    def _g2(i, j, types):
-        persons = [
-            PERSON_1_SINGULAR, PERSON_2_SINGULAR, PERSON_3_SINGULAR,
-            PERSON_1_PLURAL, PERSON_2_PLURAL, PERSON_3_PLURAL
-        ]
-        for di in range(3):
-            items_singular = get_cell(trs, i + di, j)
-            items_plural = get_cell(trs, i + di, j + 1)
-            assert items_singular, (j, trs[i + di])
-            assert items_plural, (j, trs[i + di])
-            res.append((types + [persons[di]], items_singular[0]))
-            res.append((types + [persons[di + 3]], items_plural[0]))
-
-    res.append(([INFINITIVE], get_cell(trs, 0, 0, True)[0]))
-
-    _g(1, 0, [PRESENT_PARTICIPLE])
-    _g(2, 0, [PAST_PARTICIPLE])
-
-    auxiliary = get_cell(trs, off + 3, 0)[0]
-
-    _g2(off + 5, 0, [PRESENT])
-    _g2(off + 9, 0, [PRETERITE])
-    _g2(off + 5, 1, [SUBJUNCTIVE_I])
-    _g2(off + 9, 1, [SUBJUNCTIVE_II])
-
-    for item in get_cell(trs, off + 13, 0) + get_cell(trs, off + 13, 1):
-        res.append(([IMPERATIVE], item))
-
+    table = Table(table)
+    separable = table.header(3, 0) == 'zu-infinitive'
+    off = 1 if separable else 0
+    auxiliary = read_latin(table.cell(off + 3, 0))[0]
+    res = CONJUGATION_TEMPLATES[separable].apply(table)
     return res, auxiliary, separable
 
 
 def parse_subordinate_conjugation_table(table):
-    res = []
-    trs = table.find_all('tr')
-
-    def _g2(i, j, types):
-        persons = [
-            PERSON_1_SINGULAR, PERSON_2_SINGULAR, PERSON_3_SINGULAR,
-            PERSON_1_PLURAL, PERSON_2_PLURAL, PERSON_3_PLURAL
-        ]
-        for di in range(3):
-            items_singular = get_cell(trs, i + di, j)
-            items_plural = get_cell(trs, i + di, j + 1)
-            res.append((types + [persons[di]], items_singular[0]))
-            res.append((types + [persons[di + 3]], items_plural[0]))
-
-    _g2(1, 0, [PRESENT])
-    _g2(5, 0, [PRETERITE])
-    _g2(1, 1, [SUBJUNCTIVE_I])
-    _g2(5, 1, [SUBJUNCTIVE_II])
-
-    return res
+    return SUBORDINATE_CONJUGATION_TEMPLATE.apply(Table(table))
 
 
 def get_extractors():
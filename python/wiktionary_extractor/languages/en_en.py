@@ -1,4 +1,6 @@
-from wiktionary_extractor.common import default_extractor, default_extractor_parse_variants, filter_variants
+from wiktionary_extractor.lxml_common import default_extractor, default_extractor_parse_variants, filter_variants
+
+BACKEND = 'lxml'
 
 PERSON_3_SINGULAR = '3s'
 PRESENT_PARTICIPLE = 'PRESP'
@@ -7,27 +9,27 @@ SIMPLE_PAST = 'PST'
 SIMPLE_PAST_AND_PAST_PARTICIPLE = 'PST&PP'
 
 
-def verb_extractor(node):
+def verb_extractor(section):
     # Note: variants are not parsed here, since 'form-of' class is missing
-    obj = default_extractor(node, True)
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
 
     variants = filter_variants(variants, {
-        'third-person singular simple present': [PERSON_3_SINGULAR],
-        'present participle': [PRESENT_PARTICIPLE],
-        'simple past': [SIMPLE_PAST],
-        'past participle': [PAST_PARTICIPLE],
-        'simple past and past participle': [SIMPLE_PAST_AND_PAST_PARTICIPLE],
+        'third-person singular simple present': (PERSON_3_SINGULAR,),
+        'present participle': (PRESENT_PARTICIPLE,),
+        'simple past': (SIMPLE_PAST,),
+        'past participle': (PAST_PARTICIPLE,),
+        'simple past and past participle': (SIMPLE_PAST_AND_PAST_PARTICIPLE,),
     })
 
     # decompose SIMPLE_PAST_AND_PAST_PARTICIPLE
     new_variants = []
     for k, v in variants:
-        if k == [SIMPLE_PAST_AND_PAST_PARTICIPLE]:
-            new_variants.append(([SIMPLE_PAST], v))
-            new_variants.append(([PAST_PARTICIPLE], v))
+        if k == (SIMPLE_PAST_AND_PAST_PARTICIPLE,):
+            new_variants.append(((SIMPLE_PAST,), v))
+            new_variants.append(((PAST_PARTICIPLE,), v))
         else:
             new_variants.append((k, v))
 
@@ -1,4 +1,5 @@
-from wiktionary_extractor.common import default_extractor, extract_tables, filter_variants, get_cell
+from wiktionary_extractor.common import default_extractor, extract_tables, filter_variants
+from wiktionary_extractor.table import Table, Template, read_spans, read_text
 
 # person
 PERSON_1_SINGULAR = '1s'
@@ -48,7 +49,7 @@ UNCOUNTABLE = 'uncountable'
 SUPERLATIVE = 'SUP'
 
 
-def noun_extractor(node):
+def noun_extractor(section):
     def extract_attrs(p):
         new_attrs = []
         for i in p.find_all("i"):
@@ -58,44 +59,44 @@ def noun_extractor(node):
                         new_attrs.append(a.text)
         return new_attrs
 
-    obj = default_extractor(node, True, extract_attrs)
+    obj = default_extractor(section, True, extract_attrs)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
 
     variants = filter_variants(
         variants, {
-            "plural": [PLURAL],
-            "feminine plural": [FEMININE, PLURAL],
-            "feminine": [FEMININE],
-            "masculine plural": [MASCULINE, PLURAL],
-            "masculine": [MASCULINE],
+            "plural": (PLURAL,),
+            "feminine plural": (FEMININE, PLURAL),
+            "feminine": (FEMININE,),
+            "masculine plural": (MASCULINE, PLURAL),
+            "masculine": (MASCULINE,),
         })
 
     return form, attrs, variants, definitions
 
 
-def adjective_extractor(node):
-    obj = default_extractor(node, True)
+def adjective_extractor(section):
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
 
     variants = filter_variants(
         variants, {
-            "plural": [PLURAL],
-            "feminine singular": [FEMININE],
-            "feminine plural": [FEMININE, PLURAL],
-            "feminine": [FEMININE],
-            "masculine plural": [MASCULINE, PLURAL],
-            "superlative": [SUPERLATIVE],
+            "plural": (PLURAL,),
+            "feminine singular": (FEMININE,),
+            "feminine plural": (FEMININE, PLURAL),
+            "feminine": (FEMININE,),
+            "masculine plural": (MASCULINE, PLURAL),
+            "superlative": (SUPERLATIVE,),
         })
 
     return form, attrs, variants, definitions
 
 
-def verb_extractor(node):
-    obj = default_extractor(node, True)
+def verb_extractor(section):
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, attrs, variants, definitions = obj
@@ -105,7 +106,7 @@ def verb_extractor(node):
 
     # parse conjugation table
     conjugations = []
-    for head, table in extract_tables(node):
+    for head, table in extract_tables(section):
         new_conjugations = []
         is_reflexive = form + 'se' in head or form.endswith('se')
         if 'Conjugation of ' + form in head:
@@ -115,7 +116,7 @@ def verb_extractor(node):
             new_conjugations = parse_combined_forms_table(table)
         for conj_type, conj_form in new_conjugations:
             if is_reflexive:
-                conj_type = [REFLEXIVE, *conj_type]
+                conj_type = (REFLEXIVE, *conj_type)
             conjugations.append((conj_type, conj_form))
 
     if conjugations:
@@ -124,87 +125,96 @@ def verb_extractor(node):
     return form, attrs, variants, definitions
 
 
-def parse_conjugation_table(table, is_reflexive):
-    res = []
-    trs = table.find_all('tr')
-
-    def _g(i, j, *types):
-        for item in get_cell(trs, i, j, is_reflexive):
-            res.append((types, item))
-
-    def _g2(i, t):
-        persons = [
-            PERSON_1_SINGULAR, PERSON_2_SINGULAR, PERSON_3_SINGULAR,
-            PERSON_1_PLURAL, PERSON_2_PLURAL, PERSON_3_PLURAL
-        ]
+def compile_conjugation_template(is_reflexive):
+    # forms of reflexive verbs are plain text, and they have no past participle rows
+    read = read_text if is_reflexive else read_spans
+    persons = [
+        PERSON_1_SINGULAR, PERSON_2_SINGULAR, PERSON_3_SINGULAR,
+        PERSON_1_PLURAL, PERSON_2_PLURAL, PERSON_3_PLURAL
+    ]
+    cells = [
+        (0, 0, (INFINITIVE,), read),
+        (1, 0, (GERUND,), read),
+    ]
+    if not is_reflexive:
+        cells.extend([
+            (3, 0, (PAST_PARTICIPLE, MASCULINE), read),
+            (3, 1, (PAST_PARTICIPLE, FEMININE), read),
+            (4, 0, (PAST_PARTICIPLE, MASCULINE, PLURAL), read),
+            (4, 1, (PAST_PARTICIPLE, FEMININE, PLURAL), read),
+        ])
+    rows = [
+        (8, PRESENT),
+        (9, IMPERFECT),
+        (10, PRETERITE),
+        (11, FUTURE),
+        (12, CONDITIONAL),
+        (15, SUBJUNCTIVE),
+        (16, SUBJUNCTIVE_IMPERFECT),
+        (17, SUBJUNCTIVE_IMPERFECT),
+        (21, IMPERATIVE),
+    ]
+    for i, t in rows:
         for j, person in enumerate(persons):
-            for item in get_cell(trs, i, j, is_reflexive):
-                res.append(([t, person], item))
+            cells.append((i, j, (t, person), read))
+    return Template(cells)
+
+
+CONJUGATION_TEMPLATES = {is_reflexive: compile_conjugation_template(is_reflexive) for is_reflexive in (False, True)}
+
+# rows of the combined forms table per number of rows in it
+COMBINED_FORMS_ROWS = {
+    29: [
+        (3, INFINITIVE),
+        (4, INFINITIVE),
+        (7, GERUND),
+        (8, GERUND),
+        (11, IMPERATIVE),
+        (12, IMPERATIVE),
+        (15, IMPERATIVE),
+        (16, IMPERATIVE),
+        (19, IMPERATIVE),
+        (20, IMPERATIVE),
+        (23, IMPERATIVE),
+        (24, IMPERATIVE),
+        (27, IMPERATIVE),
+        (28, IMPERATIVE),
+    ],
+    10: [
+        (3, INFINITIVE),
+        (6, GERUND),
+        (9, IMPERATIVE),
+    ],
+}
+
+COMBINED_FORMS_TEMPLATES = {
+    row_num: Template((i, j, t, read_spans) for i, t in rows for j in range(6))
+    for row_num, rows in COMBINED_FORMS_ROWS.items()
+}
+
+# sort suffixes by length in a descending order
+SUFFIXES = sorted([
+    SUFFIX_ME, SUFFIX_TE, SUFFIX_LE, SUFFIX_LA, SUFFIX_LO, SUFFIX_SE,
+    SUFFIX_NOS, SUFFIX_OS, SUFFIX_LES, SUFFIX_LAS, SUFFIX_LOS
+], key=lambda s: -len(s))
 
-    _g(0, 0, INFINITIVE)
-    _g(1, 0, GERUND)
-    if not is_reflexive:
-        _g(3, 0, PAST_PARTICIPLE, MASCULINE)
-        _g(3, 1, PAST_PARTICIPLE, FEMININE)
-        _g(4, 0, PAST_PARTICIPLE, MASCULINE, PLURAL)
-        _g(4, 1, PAST_PARTICIPLE, FEMININE, PLURAL)
-
-    _g2(8, PRESENT)
-    _g2(9, IMPERFECT)
-    _g2(10, PRETERITE)
-    _g2(11, FUTURE)
-    _g2(12, CONDITIONAL)
-    _g2(15, SUBJUNCTIVE)
-    _g2(16, SUBJUNCTIVE_IMPERFECT)
-    _g2(17, SUBJUNCTIVE_IMPERFECT)
-    _g2(21, IMPERATIVE)
 
-    return res
+def parse_conjugation_table(table, is_reflexive):
+    return CONJUGATION_TEMPLATES[is_reflexive].apply(Table(table))
 
 
 def parse_combined_forms_table(table):
-    res = []
-    trs = table.find_all('tr')
-
-    # sort suffixes by length in a descending order
-    suffixes = [
-        SUFFIX_ME, SUFFIX_TE, SUFFIX_LE, SUFFIX_LA, SUFFIX_LO, SUFFIX_SE,
-        SUFFIX_NOS, SUFFIX_OS, SUFFIX_LES, SUFFIX_LAS, SUFFIX_LOS
-    ]
-    suffixes.sort(key=lambda s: -len(s))
-
-    def _g(i, t):
-        for j in range(6):
-            for item in get_cell(trs, i, j, False):
-                # use longest match
-                for suffix in suffixes:
-                    if item.endswith(suffix):
-                        types = [t, '-' + suffix]
-                        res.append((types, item))
-                        break
-
-    if len(trs) == 29:
-        _g(3, INFINITIVE)
-        _g(4, INFINITIVE)
-        _g(7, GERUND)
-        _g(8, GERUND)
-        _g(11, IMPERATIVE)
-        _g(12, IMPERATIVE)
-        _g(15, IMPERATIVE)
-        _g(16, IMPERATIVE)
-        _g(19, IMPERATIVE)
-        _g(20, IMPERATIVE)
-        _g(23, IMPERATIVE)
-        _g(24, IMPERATIVE)
-        _g(27, IMPERATIVE)
-        _g(28, IMPERATIVE)
-    else:
-        assert len(trs) == 10, 'Unfamiliar number of rows: ' + str(len(trs))
-
-        _g(3, INFINITIVE)
-        _g(6, GERUND)
-        _g(9, IMPERATIVE)
+    table = Table(table)
+    assert len(table) in COMBINED_FORMS_TEMPLATES, 'Unfamiliar number of rows: ' + str(len(table))
 
+    res = []
+    for t, item in COMBINED_FORMS_TEMPLATES[len(table)].apply(table):
+        # use longest match
+        for suffix in SUFFIXES:
+            if item.endswith(suffix):
+                types = (t, '-' + suffix)
+                res.append((types, item))
+                break
     return res
 
 
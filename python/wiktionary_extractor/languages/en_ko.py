@@ -1,4 +1,5 @@
 from wiktionary_extractor.common import default_extractor, extract_tables
+from wiktionary_extractor.table import Table, Template
 
 STEM1 = 'stem1'
 STEM2 = 'stem2'
@@ -48,29 +49,26 @@ FUTURE = 'future'
 HONORIFIC = 'honorific'
 
 
-def verb_extractor(node):
+def verb_extractor(section):
     # Note: variants are not parsed here, since 'form-of' class is missing
-    obj = default_extractor(node, True)
+    obj = default_extractor(section, True)
     if not obj:
         return None
     form, _, _, definitions = obj
 
     conjugations = []
     conj_types = []
-    headline = node.find_next('span', {'class': 'mw-headline'}, text=['Conjugation'])
-    if headline is not None:
-        prev = headline.find_previous('span', {'class': 'mw-headline'}, text=['Verb', 'Adjective'])
-        if prev == node.span:
-            # conjugation really belongs to the current entry
-            root = headline.find_next('div', {'class': 'NavFrame'})
+    conjugation = find_conjugation_section(section)
+    if conjugation is not None:
+        nav_frames = iter_nav_frames(conjugation)
+        root, p = next(nav_frames, (None, None))
+        north_korea = p and 'North Korea' in p.text
 
-            p = root.find_previous('p')
-            north_korea = p and 'North Korea' in p.text
-
-            if north_korea:
-                # 'contains two conjugation tables (north korean and south korean), so use only the latter
-                root = root.find_next('div', {'class': 'NavFrame'})
+        if north_korea:
+            # 'contains two conjugation tables (north korean and south korean), so use only the latter
+            root, _ = next(nav_frames, (None, None))
 
+        if root is not None:
             head_text = root.find('div', {'class': 'NavHead'}).text.strip()
             if head_text.startswith('Selected forms of the adjective'):
                 is_adj = True
@@ -87,6 +85,30 @@ def verb_extractor(node):
     return form, conj_types, conjugations, definitions
 
 
+def find_conjugation_section(section):
+    # the first Conjugation section after the entry, unless it belongs to a later entry;
+    # only the headings in between are looked at, up to the end of the enclosing section
+    for following in section.following():
+        if following.level < section.level:
+            return None
+        if following.headline == 'Conjugation':
+            return following
+        if following.headline in ('Verb', 'Adjective'):
+            return None
+    return None
+
+
+def iter_nav_frames(section):
+    # the NavFrames in a section, each with the paragraph before it
+    p = None
+    for tag in section.siblings():
+        if getattr(tag, 'name', None) is None:
+            continue
+        for e in [tag] + tag.find_all(['p', 'div']):
+            if e.name == 'p':
+                p = e
+            elif e.name == 'div' and 'NavFrame' in e.get('class', []):
+                yield e, p
 def parse_stems(table):
     trs = table.find_all('tr')
     variants = []
@@ -98,7 +120,7 @@ def parse_stems(table):
 
         def _f(t, c):
             assert c is not None
-            variants.append(([t], c))
+            variants.append(((t,), c))
 
         if h == 'Stem 1':
             _f(STEM1, content)
@@ -128,6 +150,94 @@ def parse_stems(table):
     return variants, conj_types
 
 
+ROW_VERB_TYPES = [
+    (INDICATIVE, NON_PAST),
+    (INDICATIVE, PAST),
+    (INTERROGATIVE, NON_PAST),
+    (INTERROGATIVE, PAST),
+    (HORTATIVE,),
+    (IMPERATIVE,),
+    (ASSERTIVE,),
+    None,
+    (REASON,),
+    (CONTRAST,),
+    (CONJUNCTION,),
+    (CONDITION,),
+    (MOTIVE,),
+    None,
+    (VERBAL_NOUN,),
+    (VERBAL_NOUN, PAST),
+    (DETERMINER, PAST),
+    (DETERMINER, PRESENT),
+    (DETERMINER, FUTURE),
+]
+
+ROW_ADJ_TYPES = [
+    (INDICATIVE, NON_PAST),
+    (INDICATIVE, PAST),
+    (INTERROGATIVE, NON_PAST),
+    (INTERROGATIVE, PAST),
+    (ASSERTIVE,),
+    None,
+    (REASON,),
+    (CONTRAST,),
+    (CONJUNCTION,),
+    (CONDITION,),
+    None,
+    (VERBAL_NOUN,),
+    (VERBAL_NOUN, PAST),
+    (DETERMINER, PRESENT),
+    (DETERMINER, FUTURE),
+]
+
+# compiled templates by (is_adj, honorific, whether the imperative row is missing)
+_templates = {}
+
+
+def get_row_types(is_adj, honorific):
+    row_types = ROW_ADJ_TYPES if is_adj else ROW_VERB_TYPES
+    if honorific:
+        if not is_adj:
+            # honorific table is almost the same as the non-honorific table except that the latter missing hortative row
+            row_types = [t for t in row_types if t != (HORTATIVE,)]
+        row_types = [t + (HONORIFIC,) if t is not None else None for t in row_types]
+    return row_types
+
+
+def read_forms(td):
+    span = td and td.find('span')
+    if not span:
+        return []
+    return [form.strip() for form in span.text.strip().split(',')]
+
+
+def compile_conjugation_template(row_types, skip_imperative):
+    cells = []
+    i = 2
+    for row_t in row_types:
+        if skip_imperative and row_t is not None and IMPERATIVE in row_t:
+            continue
+        if row_t is not None:
+            for j, t in enumerate(TYPES):
+                cells.append((i, j, row_t + (t,), read_forms))
+        i += 1
+    return Template(cells)
+
+
+def get_conjugation_template(table, is_adj, honorific):
+    row_types = get_row_types(is_adj, honorific)
+    # imperative can be skipped, in which case the assertive row takes its place
+    skip_imperative = False
+    for k, row_t in enumerate(row_types):
+        if row_t is not None and IMPERATIVE in row_t:
+            skip_imperative = table.header(2 + k) == 'Assertive'
+            break
+    key = is_adj, honorific, skip_imperative
+    if key not in _templates:
+        _templates[key] = compile_conjugation_template(row_types, skip_imperative)
+    return _templates[key]
+
+
 def parse_conjugation_table(root, is_adj):
     tables = root.find_all('table')
     assert 2 <= len(tables) <= 3, tables
@@ -138,85 +248,9 @@ def parse_conjugation_table(root, is_adj):
     variants, conj_types = parse_stems(tables[0])
     res.extend(variants)
 
-    row_verb_types = [
-        [INDICATIVE, NON_PAST],
-        [INDICATIVE, PAST],
-        [INTERROGATIVE, NON_PAST],
-        [INTERROGATIVE, PAST],
-        [HORTATIVE],
-        [IMPERATIVE],
-        [ASSERTIVE],
-        None,
-        [REASON],
-        [CONTRAST],
-        [CONJUNCTION],
-        [CONDITION],
-        [MOTIVE],
-        None,
-        [VERBAL_NOUN],
-        [VERBAL_NOUN, PAST],
-        [DETERMINER, PAST],
-        [DETERMINER, PRESENT],
-        [DETERMINER, FUTURE],
-    ]
-
-    row_adj_types = [
-        [INDICATIVE, NON_PAST],
-        [INDICATIVE, PAST],
-        [INTERROGATIVE, NON_PAST],
-        [INTERROGATIVE, PAST],
-        [ASSERTIVE],
-        None,
-        [REASON],
-        [CONTRAST],
-        [CONJUNCTION],
-        [CONDITION],
-        None,
-        [VERBAL_NOUN],
-        [VERBAL_NOUN, PAST],
-        [DETERMINER, PRESENT],
-        [DETERMINER, FUTURE],
-    ]
-
-    def _f(table, ts):
-        trs = table.find_all('tr')
-
-        def _g(i, types):
-            tr = trs[i]
-            tds = tr.find_all('td')
-            for td, t in zip(tds, TYPES):
-                span = td.find('span')
-                if span:
-                    text = span.text.strip()
-                    for form in text.split(','):
-                        form = form.strip()
-                        res.append((types + [t], form))
-
-        idx = 2
-        for row_t in ts:
-            tr = trs[idx]
-            th = tr.th
-            th = th and th.text.strip()
-            if th and th == 'Assertive':
-                if IMPERATIVE in row_t:
-                    # imperative can be skipped
-                    continue
-            if row_t is not None:
-                _g(idx, row_t)
-            idx += 1
-
-    def add_honorific(types):
-        return map(lambda t: t + [HONORIFIC] if t is not None else None, types)
-
-    if is_adj:
-        _f(tables[1], row_adj_types)
-        if len(tables) > 2:
-            _f(tables[2], add_honorific(row_adj_types))
-    else:
-        _f(tables[1], row_verb_types)
-        if len(tables) > 2:
-            # honorific table is almost the same as the non-honorific table except that the latter missing hortative row
-            _f(tables[2], add_honorific(filter(lambda t: t != [HORTATIVE], row_verb_types)))
+    for honorific, table in enumerate(tables[1:]):
+        table = Table(table)
+        res.extend(get_conjugation_template(table, is_adj, bool(honorific)).apply(table))
 
     return res, conj_types
 
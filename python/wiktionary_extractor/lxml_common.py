@@ -0,0 +1,213 @@
+# lxml.html implementation of the extractor contract in `common`, for languages whose
+# extractors only rely on `default_extractor`, `extract_tables`, `get_cell` and `get_th`
+import lxml.html
+from lxml import etree
+
+from wiktionary_extractor.common import LONG_DESCRIPTION_NAMES, SKIPPED_DEFINITION_CLASSES
+from wiktionary_extractor.common import filter_variants  # noqa: F401 (backend-independent)
+from wiktionary_extractor.prune import GARBAGE_CLASSES, PRUNED_TAGS
+from wiktionary_extractor.sections import HEADING_NAMES, Section, build_sections
+
+
+def _has_class(name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' {} ')".format(name)
+
+
+HEADINGS = etree.XPath('|'.join('//' + name for name in HEADING_NAMES))
+HEADLINE = etree.XPath('descendant::span[{}][1]'.format(_has_class('mw-headline')))
+# substring candidates, whose classes are then matched exactly against GARBAGE_CLASSES
+GARBAGE = etree.XPath("//div[contains(@class, 'floatright')]|//span[contains(@class, 'maintenance-line')]")
+FORM_OF = etree.XPath('b[{}]'.format(_has_class('form-of')))
+DEFINITION_TAGS = ('a', 'span') + tuple(LONG_DESCRIPTION_NAMES)
+NAV_FRAME_CLASS = 'NavFrame'
+
+
+class LxmlSection(Section):
+    def siblings(self):
+        tag = self.node.getnext()
+        while tag is not None and tag is not self.end:
+            yield tag
+            tag = tag.getnext()
+
+    def release(self, stop):
+        # see `Section.release`
+        parent = self.node.getparent()
+        if stop is not None and stop.getparent() is not parent:
+            return
+        tag = self.node
+        while tag is not None and tag is not stop:
+            next_tag = tag.getnext()
+            parent.remove(tag)
+            tag = next_tag
+
+
+def get_text(elt):
+    # plain str, so that results can be pickled between processes
+    return str(elt.text_content())
+
+
+def get_classes(elt):
+    return (elt.get('class') or '').split()
+
+
+def parse(source, pruner=None):
+    # `source` is a path, or the page itself as UTF-8 bytes; with a `prune.Pruner`, comments are
+    # not built and pruned tags are stripped right away, but pruned classes are left to the tree:
+    # a Python parser target would prune them too, at several times the cost of lxml's own parsing
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+    parser = lxml.html.HTMLParser(encoding='utf-8', remove_comments=pruner is not None)
+    root = lxml.html.document_fromstring(source, parser=parser)
+    if pruner is not None:
+        etree.strip_elements(root, *PRUNED_TAGS, with_tail=False)
+    return root
+
+
+def clean(root):
+    for e in GARBAGE(root):
+        if not GARBAGE_CLASSES[e.tag].isdisjoint(get_classes(e)):
+            e.drop_tree()
+
+
+def index_sections(root):
+    headings = []
+    for node in HEADINGS(root):
+        spans = HEADLINE(node)
+        headline = get_text(spans[0]) if spans else None
+        headings.append((headline, int(node.tag[1]), node))
+    return build_sections(headings, LxmlSection)
+
+
+def get_next(tag, name, prev=False, end=None):
+    # search stops at `end` (exclusive), e.g. the heading closing the current section
+    tag = tag.getnext() if not prev else tag.getprevious()
+    while tag is not None and tag is not end and tag.tag != name:
+        if prev:
+            tag = tag.getprevious()
+        else:
+            tag = tag.getnext()
+    if tag is end:
+        return None
+    return tag
+
+
+def extract_tables(section):
+    for div in section.siblings():
+        if div.tag != 'div':
+            continue
+        if NAV_FRAME_CLASS in get_classes(div):
+            head = get_text(div.find('.//div')).strip()
+            table = div.find('.//table')
+            yield head, table
+
+
+def default_extractor_parse_variants(section, extract_attrs=None):
+    return default_extractor(
+        section, parse_variants=True, extract_attrs=extract_attrs)
+
+
+def default_extractor(section, parse_variants=False, extract_attrs=None):
+    # parse form
+    p = get_next(section.node, 'p', end=section.end)
+    from_elt = p.find('.//strong')
+    if from_elt is None:
+        # sometimes headword is tagged by <b>
+        from_elt = p.find('.//b')
+    form = get_text(from_elt)
+
+    # parse attributes
+    attrs = []
+    gender_span = p.find('.//span')
+    if gender_span is not None:
+        for abbr in gender_span.iterdescendants('abbr'):
+            attrs.append(get_text(abbr))
+
+    if extract_attrs:
+        new_attrs = extract_attrs(p)
+        attrs.extend(new_attrs)
+
+    # parse other forms
+    variants = []
+    if parse_variants:
+        last_variant_type = None
+        for b in FORM_OF(p):
+
+            variant_type = get_text(get_next(b, 'i', prev=True))
+
+            if variant_type == 'or':
+                # expand "or"
+                assert last_variant_type is not None
+                variant_type = last_variant_type
+            else:
+                last_variant_type = variant_type
+
+            variant_form = get_text(b)
+            variants.append((variant_type, variant_form))
+
+    # parse definitions
+    definitions = []
+    ol = get_next(p, 'ol', end=section.end)
+    if ol is None:
+        ol = get_next(p, 'ul', end=section.end)
+    if ol is None:
+        return None
+    for li in ol.iterchildren('li'):
+        long_descriptions = scan_definition(li)
+        if long_descriptions is None:
+            continue
+
+        # remove long description
+        for e in long_descriptions:
+            e.drop_tree()
+
+        definition = get_text(li).strip()
+        assert '\n' not in definition, definition
+
+        # skip unrendered template
+        if 'Template:' in definition:
+            continue
+
+        if len(definition) > 0:
+            definitions.append(definition)
+
+    if len(definitions) > 0:
+        return form, attrs, variants, definitions
+    else:
+        return None
+
+
+def scan_definition(li):
+    # see `common.scan_definition`
+    long_descriptions = []
+    for tag in li.iter(*DEFINITION_TAGS):
+        name = tag.tag
+        if name == 'a':
+            # untranslated definition
+            if get_text(tag) == 'rfdef':
+                return None
+        elif name == 'span':
+            # variant
+            if tag.getparent() is li and not SKIPPED_DEFINITION_CLASSES.isdisjoint(get_classes(tag)):
+                return None
+        else:
+            long_descriptions.append(tag)
+    return long_descriptions
+
+
+def get_th(trs, i, j):
+    ths = list(trs[i].iterdescendants('th'))
+    th = ths[j]
+    return get_text(th).strip()
+
+
+def get_cell(trs, i, j, direct=False, tag='span'):
+    tds = list(trs[i].iterdescendants('td'))
+    res = []
+    td = tds[j]
+    if direct:
+        res.append(get_text(td).strip())
+    else:
+        for tag in td.iterdescendants(tag):
+            res.append(get_text(tag).strip())
+    return res
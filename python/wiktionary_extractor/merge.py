@@ -0,0 +1,93 @@
+# Merges the part files written by the workers (`main.py --output-dir`) into one output
+# sorted by lemma and part of speech, with entries extracted from several pages written once.
+#
+# This is an external sort: the input is cut into runs of at most `run_size` bytes which are
+# sorted in memory and spilled to temporary files, and the runs are then k-way merged, so
+# memory is bounded by the run size rather than by the size of the input.
+import heapq
+import json
+import os
+import tempfile
+
+from wiktionary_extractor.index import open_input
+
+DEFAULT_RUN_SIZE = 64 << 20
+
+
+def list_parts(paths):
+    # directories are expanded to the part files in them
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.startswith('part-'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def sort_key(line):
+    # lemma, part of speech and then the line itself, so that duplicates become adjacent
+    # and the order does not depend on which worker extracted an entry
+    obj, _ = json.loads(line)
+    return obj[0], obj[1], line
+
+
+def read_lines(paths):
+    for path in paths:
+        f = open_input(path)
+        try:
+            for line in f:
+                # a torn last line is left by a killed worker; its page was not checkpointed
+                # and is extracted again on --resume
+                if line.endswith(b'\n') and line.strip():
+                    yield line
+        finally:
+            f.close()
+
+
+def write_run(lines, tmp_dir):
+    lines = sorted(set(lines), key=sort_key)
+    fd, path = tempfile.mkstemp(prefix='run-', suffix='.ndjson', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        f.writelines(lines)
+    return path
+
+
+def make_runs(lines, tmp_dir, run_size=DEFAULT_RUN_SIZE):
+    run = []
+    size = 0
+    run_paths = []
+    for line in lines:
+        run.append(line)
+        size += len(line)
+        if size >= run_size:
+            run_paths.append(write_run(run, tmp_dir))
+            run = []
+            size = 0
+    if run:
+        run_paths.append(write_run(run, tmp_dir))
+    return run_paths
+
+
+def read_run(path):
+    with open(path, 'rb') as f:
+        for line in f:
+            yield sort_key(line), line
+
+
+def merge_runs(run_paths, stream):
+    # returns the number of lines written
+    line_num = 0
+    last = None
+    for _, line in heapq.merge(*map(read_run, run_paths)):
+        if line != last:
+            stream.write(line)
+            line_num += 1
+            last = line
+    return line_num
+
+
+def merge_parts(paths, stream, run_size=DEFAULT_RUN_SIZE, tmp_dir=None):
+    with tempfile.TemporaryDirectory(prefix='merge-', dir=tmp_dir) as run_dir:
+        run_paths = make_runs(read_lines(list_parts(paths)), run_dir, run_size)
+        return merge_runs(run_paths, stream)
@@ -0,0 +1,107 @@
+import cProfile
+import heapq
+import pstats
+import sys
+import time
+
+SLOWEST_PAGE_NUM = 20
+
+
+def get_extractor_name(extractor):
+    return '{}.{}'.format(extractor.__module__.rsplit('.', 1)[-1], extractor.__name__)
+
+
+class ExtractorProfile(object):
+    # per-worker counters of extractor calls, keyed by (language, POS, extractor);
+    # `cprofile_target` names an extractor (e.g. 'en_de.verb_extractor') to run under cProfile
+    def __init__(self, lang, cprofile_target=None):
+        self.lang = lang
+        self.cprofile_target = cprofile_target
+        self.profiler = cProfile.Profile() if cprofile_target else None
+        self.reset()
+
+    def reset(self):
+        # [call count, cumulative seconds, max seconds]
+        self.calls = {}
+        self.pages = []
+        if self.profiler:
+            self.profiler.clear()
+
+    def call(self, pos, extractor, section):
+        name = get_extractor_name(extractor)
+        profiler = self.profiler if name == self.cprofile_target else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            return extractor(section)
+        finally:
+            if profiler:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            stat = self.calls.setdefault((self.lang, pos, name), [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += elapsed
+            stat[2] = max(stat[2], elapsed)
+
+    def add_page(self, name, seconds):
+        item = (seconds, str(name))
+        if len(self.pages) < SLOWEST_PAGE_NUM:
+            heapq.heappush(self.pages, item)
+        else:
+            heapq.heappushpop(self.pages, item)
+
+    def pop(self):
+        # picklable summary, sent to the parent with every batch
+        stats = {'calls': self.calls, 'pages': self.pages, 'pstats': None}
+        if self.profiler:
+            self.profiler.create_stats()
+            stats['pstats'] = self.profiler.stats
+        self.reset()
+        return stats
+
+
+class _RawStats(object):
+    # lets pstats load stats which were collected in another process
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileReport(object):
+    # aggregate of the summaries of all workers
+    def __init__(self):
+        self.calls = {}
+        self.pages = []
+        self.pstats = None
+
+    def merge(self, stats):
+        for key, (count, total, longest) in stats['calls'].items():
+            stat = self.calls.setdefault(key, [0, 0.0, 0.0])
+            stat[0] += count
+            stat[1] += total
+            stat[2] = max(stat[2], longest)
+        self.pages = heapq.nlargest(SLOWEST_PAGE_NUM, self.pages + stats['pages'])
+        if stats['pstats']:
+            if self.pstats is None:
+                self.pstats = pstats.Stats(_RawStats(stats['pstats']))
+            else:
+                self.pstats.add(_RawStats(stats['pstats']))
+
+    def print(self, file=sys.stderr):
+        print('{:<8} {:<16} {:<40} {:>8} {:>10} {:>10} {:>10}'.format(
+            'lang', 'pos', 'extractor', 'calls', 'total', 'mean', 'max'), file=file)
+        for (lang, pos, name), (count, total, longest) in sorted(self.calls.items(), key=lambda item: -item[1][1]):
+            print('{:<8} {:<16} {:<40} {:>8} {:>9.3f}s {:>8.2f}ms {:>8.2f}ms'.format(
+                lang, pos, name, count, total, total / count * 1000, longest * 1000), file=file)
+        print('Slowest pages:', file=file)
+        for seconds, name in self.pages:
+            print('{:>9.3f}s {}'.format(seconds, name), file=file)
+
+    def dump_pstats(self, path):
+        if self.pstats is None:
+            print('No calls of the profiled extractor', file=sys.stderr)
+            return
+        self.pstats.dump_stats(path)
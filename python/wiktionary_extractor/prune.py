@@ -0,0 +1,62 @@
+# Regions of a page which no extractor reads, left out while the page is parsed
+# instead of being built and thrown away.
+from bs4.builder import LXMLTreeBuilder
+
+# tags left out wherever they are
+PRUNED_TAGS = frozenset(['script', 'style', 'noscript'])
+# classes left out on any tag: the table of contents, edit links, category links,
+# and translation and audio tables
+DEFAULT_PRUNED_CLASSES = frozenset(['toc', 'mw-editsection', 'catlinks', 'translations', 'audiotable'])
+# classes left out on one tag only, which `clean()` would remove anyway
+GARBAGE_CLASSES = {
+    'div': frozenset(['floatright']),
+    'span': frozenset(['maintenance-line']),
+}
+NO_CLASSES = frozenset()
+
+
+class Pruner(object):
+    def __init__(self, pruned_classes=DEFAULT_PRUNED_CLASSES):
+        self.pruned_classes = frozenset(pruned_classes)
+
+    def is_pruned(self, tag, classes):
+        # `classes` is the value of the class attribute, or None
+        if tag in PRUNED_TAGS:
+            return True
+        if not classes:
+            return False
+        classes = classes.split()
+        garbage_classes = GARBAGE_CLASSES.get(tag, NO_CLASSES)
+        return not (self.pruned_classes.isdisjoint(classes) and garbage_classes.isdisjoint(classes))
+
+
+class PruningTreeBuilder(LXMLTreeBuilder):
+    # bs4 builder which drops the parser events of pruned elements and everything inside them,
+    # and of comments; text following a pruned element is kept, as `extract()` would
+    def __init__(self, pruner, **kwargs):
+        super(PruningTreeBuilder, self).__init__(**kwargs)
+        self.pruner = pruner
+        self.pruned_depth = 0
+
+    def start(self, tag, attrib, nsmap={}):
+        if self.pruned_depth or self.pruner.is_pruned(tag, attrib.get('class')):
+            self.pruned_depth += 1
+            return
+        super(PruningTreeBuilder, self).start(tag, attrib, nsmap)
+
+    def end(self, tag):
+        if self.pruned_depth:
+            self.pruned_depth -= 1
+            return
+        super(PruningTreeBuilder, self).end(tag)
+
+    def data(self, data):
+        if not self.pruned_depth:
+            super(PruningTreeBuilder, self).data(data)
+
+    def comment(self, text):
+        pass
+
+    def pi(self, target, data):
+        if not self.pruned_depth:
+            super(PruningTreeBuilder, self).pi(target, data)
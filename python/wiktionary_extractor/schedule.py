@@ -0,0 +1,67 @@
+# Order in which the inputs of a run are dispatched, with their size standing in for the time
+# they take: a few huge pages (e.g. Korean verbs with 1000+ conjugation rows) met at the end
+# of a run leave one worker running alone while the others are idle.
+#
+#   input          the order of the roots and of os.listdir
+#   largest-first  descending size
+#   balanced       descending size, in batches closed at the size of an average batch, so
+#                  that the largest pages are not sent to a single worker together
+import heapq
+import json
+import os
+
+SCHEDULES = ['input', 'largest-first', 'balanced']
+
+
+def read_manifest(path):
+    # sizes by absolute path, from JSON objects with "path" and "size" one per line, such as
+    # the checkpoint of an earlier run
+    sizes = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            sizes[record['path']] = record['size']
+    return sizes
+
+
+def get_sizes(paths, manifest=None):
+    # sizes of the paths, taken from the manifest where it has them and stat'ed otherwise
+    sizes = {}
+    for path in paths:
+        size = manifest.get(os.path.abspath(path)) if manifest is not None else None
+        sizes[path] = size if size is not None else os.stat(path).st_size
+    return sizes
+
+
+def order_paths(paths, sizes, schedule):
+    if schedule == 'input':
+        return list(paths)
+    # stable, so that pages of the same size keep the input order
+    return sorted(paths, key=lambda path: -sizes[path])
+
+
+def get_max_batch_bytes(sizes, batch_size, schedule):
+    # the size at which a batch is closed before it has `batch_size` pages, or None
+    if schedule != 'balanced' or not sizes:
+        return None
+    batch_num = -(-len(sizes) // batch_size)
+    return sum(sizes.values()) / batch_num
+
+
+def simulate(batches, sizes, worker_num):
+    # (end of the run, time the first worker runs out of work) with every batch taken by the
+    # first free worker, in bytes
+    finish = [0] * worker_num
+    for batch in batches:
+        start = heapq.heappop(finish)
+        heapq.heappush(finish, start + sum(sizes.get(path, 0) for path in batch))
+    return max(finish), min(finish)
+
+
+def get_tail(batches, sizes, worker_num):
+    # share of the run during which some worker has nothing left to do
+    end, first_idle = simulate(batches, sizes, worker_num)
+    return (end - first_idle) / end if end else 0.0
@@ -0,0 +1,78 @@
+HEADING_NAMES = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+
+class Section(object):
+    def __init__(self, headline, level, node):
+        self.headline = headline
+        self.level = level
+        self.node = node
+        # heading which closes this section (None if it runs to the end of its parent)
+        self.end = None
+        # the section tree: the enclosing section (None at the top level), the subsections,
+        # and the section which follows in document order
+        self.parent = None
+        self.children = []
+        self.next = None
+
+    def following(self):
+        # the sections after this one in document order
+        section = self.next
+        while section is not None:
+            yield section
+            section = section.next
+
+    def siblings(self):
+        tag = self.node.next_sibling
+        while tag is not None and tag is not self.end:
+            yield tag
+            tag = tag.next_sibling
+
+    def release(self, stop):
+        # frees the heading and the content up to `stop` (the next heading) once they are extracted;
+        # nothing is freed unless `stop` is a sibling, so that later sections stay intact
+        if stop is not None and stop.parent is not self.node.parent:
+            return
+        tag = self.node
+        while tag is not None and tag is not stop:
+            next_tag = tag.next_sibling
+            if hasattr(tag, 'decompose'):
+                tag.decompose()
+            else:
+                tag.extract()
+            tag = next_tag
+
+
+def get_headline(node):
+    span = node.find('span', {'class', 'mw-headline'})
+    if span:
+        return span.text
+    else:
+        return None
+
+
+def index_sections(root):
+    headings = []
+    for node in root.find_all(HEADING_NAMES):
+        headings.append((get_headline(node), int(node.name[1]), node))
+    return build_sections(headings)
+
+
+def build_sections(headings, section_class=Section):
+    # `headings` are (headline, level, node) in document order;
+    # a section is closed by the next headline of the same or a higher level
+    sections = []
+    stack = []
+    for headline, level, node in headings:
+        if not headline:
+            continue
+        while stack and stack[-1].level >= level:
+            stack.pop().end = node
+        section = section_class(headline, level, node)
+        if stack:
+            section.parent = stack[-1]
+            stack[-1].children.append(section)
+        if sections:
+            sections[-1].next = section
+        stack.append(section)
+        sections.append(section)
+    return sections
@@ -0,0 +1,129 @@
+# Packed shard format: many rendered pages in one file, so that reading them does not
+# cost a metadata lookup and an open() per page.
+#
+#   magic | record* | offset index (u64 per record) | footer
+#
+# where a record is `<payload length u32><name length u16><compression u8><name><payload>`
+# and the footer is `<index offset u64><record count u32><magic>`.
+import mmap
+import os
+import struct
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'WXSHARD1'
+EXTENSION = '.shard'
+RECORD_HEADER = struct.Struct('<IHB')
+INDEX_ENTRY = struct.Struct('<Q')
+FOOTER = struct.Struct('<QI8s')
+
+RAW = 0
+ZLIB = 1
+ZSTD = 2
+COMPRESSIONS = {'none': RAW, 'zlib': ZLIB, 'zstd': ZSTD}
+
+
+def is_shard(path):
+    return path.endswith(EXTENSION)
+
+
+def compress(data, compression):
+    if compression == ZLIB:
+        return zlib.compress(data)
+    elif compression == ZSTD:
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def decompress(data, compression):
+    if compression == ZLIB:
+        return zlib.decompress(data)
+    elif compression == ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def write_shard(path, records, compression=RAW):
+    # `records` are (name, bytes) pairs
+    if compression == ZSTD and zstandard is None:
+        raise RuntimeError('zstandard is required for zstd compression')
+    offsets = []
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        for name, data in records:
+            offsets.append(f.tell())
+            name = name.encode('utf-8')
+            payload = compress(data, compression)
+            f.write(RECORD_HEADER.pack(len(payload), len(name), compression))
+            f.write(name)
+            f.write(payload)
+        index_offset = f.tell()
+        f.write(b''.join(INDEX_ENTRY.pack(offset) for offset in offsets))
+        f.write(FOOTER.pack(index_offset, len(offsets), MAGIC))
+    os.replace(tmp_path, path)
+    return len(offsets)
+
+
+class ShardReader(object):
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        index_offset, self.count, magic = FOOTER.unpack_from(self.buf, len(self.buf) - FOOTER.size)
+        if self.buf[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            raise ValueError('Not a shard: ' + path)
+        self.index_offset = index_offset
+
+    def __len__(self):
+        return self.count
+
+    def _header(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        offset, = INDEX_ENTRY.unpack_from(self.buf, self.index_offset + i * INDEX_ENTRY.size)
+        length, name_length, compression = RECORD_HEADER.unpack_from(self.buf, offset)
+        name_offset = offset + RECORD_HEADER.size
+        return name_offset, name_length, length, compression
+
+    def name(self, i):
+        name_offset, name_length, _, _ = self._header(i)
+        return self.buf[name_offset:name_offset + name_length].decode('utf-8')
+
+    def read(self, i):
+        name_offset, name_length, length, compression = self._header(i)
+        data_offset = name_offset + name_length
+        name = self.buf[name_offset:data_offset].decode('utf-8')
+        data = decompress(self.buf[data_offset:data_offset + length], compression)
+        return name, data
+
+    def close(self):
+        self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_files(paths):
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield os.path.basename(path), f.read()
+
+
+def pack_directory(src_dir, dst_prefix, records_per_shard, compression=RAW):
+    # writes <dst_prefix>-00000.shard, <dst_prefix>-00001.shard, ... and returns their paths
+    names = sorted(os.listdir(src_dir))
+    shard_paths = []
+    for start in range(0, len(names), records_per_shard):
+        shard_path = '{}-{:05d}{}'.format(dst_prefix, len(shard_paths), EXTENSION)
+        paths = [os.path.join(src_dir, name) for name in names[start:start + records_per_shard]]
+        write_shard(shard_path, read_files(paths), compression)
+        shard_paths.append(shard_path)
+    return shard_paths
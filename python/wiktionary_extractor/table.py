@@ -0,0 +1,58 @@
+# Tables materialized once, and declarative templates mapping their cells to grammatical tags.
+
+
+class Table(object):
+    # a table whose rows are scanned once: `rows[i]` are the <td> cells of the i-th <tr> as
+    # found by `tr.find_all('td')`, which is how the templates of the languages index cells
+    def __init__(self, table):
+        self.trs = table.find_all('tr')
+        self.rows = [tr.find_all('td') for tr in self.trs]
+        self._headers = {}
+
+    def __len__(self):
+        return len(self.trs)
+
+    def cell(self, i, j):
+        # None if the row has no j-th cell
+        row = self.rows[i]
+        return row[j] if j < len(row) else None
+
+    def header(self, i, j=0):
+        # text of the j-th <th> of the i-th row, or None
+        if i not in self._headers:
+            self._headers[i] = [th.text.strip() for th in self.trs[i].find_all('th')]
+        headers = self._headers[i]
+        return headers[j] if j < len(headers) else None
+
+
+class Template(object):
+    # cells of one table layout as (row, column, types, read) in output order, where
+    # `read(td)` returns the forms in the cell (td is None if the row is shorter);
+    # compiled once per layout by the languages
+    def __init__(self, cells):
+        self.cells = list(cells)
+
+    def apply(self, table):
+        res = []
+        for i, j, types, read in self.cells:
+            for item in read(table.cell(i, j)):
+                res.append((types, item))
+        return res
+
+
+def read_text(td):
+    return [td.text.strip()]
+
+
+def read_spans(td):
+    return [span.text.strip() for span in td.find_all('span')]
+
+
+def first(read):
+    # only the first form of a cell, which must have one
+    def read_first(td):
+        items = read(td)
+        assert items, td
+        return items[:1]
+
+    return read_first
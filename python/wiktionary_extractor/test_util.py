@@ -1,48 +1,9 @@
 import os
 import json
-from functools import total_ordering
 
+from wiktionary_extractor.entry import Entry
 from wiktionary_extractor.extractor import extract_from_path
-from wiktionary_extractor.util import get_extractors
-
-
-@total_ordering
-class Entry(object):
-    def __init__(self, obj):
-        lemma, pos, attrs, variants, defs = obj
-        self.lemma = lemma
-        self.pos = pos
-        self.attrs = attrs
-        self.variants = variants
-        self.defs = defs
-
-    def convert(self):
-        return {
-            'lemma': self.lemma,
-            'pos': self.pos,
-            'attrs': self.attrs,
-            'variants': [{
-                'type': k,
-                'form': v
-            } for k, v in self.variants],
-            'defs': self.defs,
-        }
-
-    @classmethod
-    def deconvert(cls, obj):
-        variants = [(item['type'], item['form']) for item in obj['variants']]
-        return Entry(
-            [obj['lemma'], obj['pos'], obj['attrs'], variants, obj['defs']])
-
-    def __eq__(self, other):
-        return self.convert() == other.convert()
-
-    def __ne__(self, other):
-        return not (self == other)
-
-    def __lt__(self, other):
-        return self.convert().items() < other.convert().items()
-
+from wiktionary_extractor.util import get_backend, get_extractors
 
 
 def assert_entry_equal(correct_entry, parsed_entry):
@@ -79,9 +40,10 @@ def list_test_data(lang):
 
 def run_extractors_on_test_data(lang):
     extractors = get_extractors(lang)
+    backend = get_backend(lang)
     for html_path in list_test_data(lang):
-        args = html_path, extractors
-        parsed = list(map(Entry, extract_from_path(args)))
+        args = html_path, extractors, backend
+        parsed = extract_from_path(args)
         yield html_path, parsed
 
 
@@ -1,7 +1,34 @@
-import wiktionary_extractor.languages
-from wiktionary_extractor.languages import *
+from wiktionary_extractor import languages
+from wiktionary_extractor.dispatch import DEFAULT_BACKEND, Dispatcher
+from wiktionary_extractor.prune import DEFAULT_PRUNED_CLASSES
+
+# compiled extractor tables, per language and prefilter mode
+_dispatchers = {}
+
+
+def get_language_module(lang):
+    return languages.get_module(lang)
 
 
 def get_extractors(lang):
-    lang_mod = getattr(wiktionary_extractor.languages, lang.replace('-', '_'))
+    lang_mod = get_language_module(lang)
     return lang_mod.get_extractors()
+
+
+def get_backend(lang):
+    # parsing backend used by the language's extractors ('bs4' or 'lxml')
+    lang_mod = get_language_module(lang)
+    return getattr(lang_mod, 'BACKEND', DEFAULT_BACKEND)
+
+
+def get_pruned_classes(lang):
+    # classes whose elements the language's extractors never read (None to keep the whole page)
+    lang_mod = get_language_module(lang)
+    return getattr(lang_mod, 'PRUNED_CLASSES', DEFAULT_PRUNED_CLASSES)
+
+
+def get_dispatcher(lang, prefilter='on'):
+    key = lang, prefilter
+    if key not in _dispatchers:
+        _dispatchers[key] = Dispatcher(get_extractors(lang), get_backend(lang), prefilter, get_pruned_classes(lang))
+    return _dispatchers[key]
@@ -0,0 +1,205 @@
+import multiprocessing.pool
+import multiprocessing.util
+import os
+import resource
+import signal
+import threading
+import time
+from collections import Counter
+
+from wiktionary_extractor import inputs
+from wiktionary_extractor.cache import ExtractionCache, hash_bytes
+from wiktionary_extractor.extractor import extract_from_source
+from wiktionary_extractor.profiling import ExtractorProfile, ProfileReport
+from wiktionary_extractor.util import get_dispatcher
+from wiktionary_extractor.writer import NDJSONWriter, get_encoder, reformat
+
+# loaded once per worker process by `init_worker`, instead of being pickled with every task
+_dispatcher = None
+_cache = None
+_profile = None
+_read_mode = 'read'
+_max_rss = None
+_part = None
+_task_done = False
+
+
+def init_worker(lang,
+                cache_path=None,
+                version=None,
+                profile=False,
+                cprofile_target=None,
+                max_rss=None,
+                output_dir=None,
+                fast_json=False,
+                prefilter='on',
+                read_mode='read'):
+    global _dispatcher, _cache, _profile, _max_rss, _part, _read_mode
+    # SIGTERM is handled by the parent, which flushes the output
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _dispatcher = get_dispatcher(lang, prefilter)
+    if cache_path is not None:
+        _cache = ExtractionCache(cache_path, version, readonly=True)
+    if profile or cprofile_target:
+        _profile = ExtractorProfile(lang, cprofile_target)
+    _max_rss = max_rss
+    _read_mode = read_mode
+    if output_dir is not None:
+        _part = open_part(output_dir, fast_json)
+
+
+def get_part_path(output_dir, pid):
+    return os.path.join(output_dir, 'part-{}.ndjson'.format(pid))
+
+
+def open_part(output_dir, fast_json):
+    # every worker appends to a part file of its own, so that entries do not go through the parent;
+    # it is flushed after each batch, and closed when the worker exits normally
+    part = NDJSONWriter(
+        open(get_part_path(output_dir, os.getpid()), 'ab'), flush_interval=float('inf'), encode=get_encoder(fast_json))
+    multiprocessing.util.Finalize(part, part.close, exitpriority=10)
+    return part
+
+
+def make_batches(tasks, batch_size, sizes=None, max_bytes=None):
+    # with `max_bytes`, a batch is also closed once the `sizes` of its pages add up to it
+    # (pages which are not in `sizes`, such as shard records, count as empty); `inputs.FLUSH`
+    # among the tasks closes the current batch
+    batch = []
+    batch_bytes = 0
+    for task in tasks:
+        if task is inputs.FLUSH:
+            if batch:
+                yield batch
+                batch = []
+                batch_bytes = 0
+            continue
+        batch.append(task)
+        if max_bytes is not None and isinstance(task, str):
+            batch_bytes += sizes.get(task, 0)
+        if len(batch) >= batch_size or (max_bytes is not None and batch_bytes >= max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+
+class PendingLimit(object):
+    # the pool's task handler takes batches from its input as fast as it can, which would read
+    # a whole stream into memory; `feed` holds it back to `limit` batches whose results have not
+    # been `release`d yet, so that a producer writing to a pipe blocks instead
+    def __init__(self, limit):
+        self.semaphore = threading.Semaphore(limit)
+        self.closed = False
+
+    def feed(self, batches):
+        # a batch is read from `batches` only once it can be sent
+        batches = iter(batches)
+        while True:
+            self.semaphore.acquire()
+            batch = None if self.closed else next(batches, None)
+            if batch is None:
+                return
+            yield batch
+
+    def release(self):
+        self.semaphore.release()
+
+    def close(self):
+        # unblocks the task handler, so that the pool can shut down
+        self.closed = True
+        self.semaphore.release()
+
+
+def extract_page(task):
+    # returns (task, objs, content hash to be cached by the parent or None); the task goes back
+    # to the parent without the page it may carry
+    name, source = inputs.load(task, _read_mode)
+    task = inputs.get_task_id(task)
+    if _cache is None:
+        return task, extract_source(name, source), None
+    content_hash = hash_bytes(source)
+    objs = _cache.get(content_hash)
+    if objs is not None:
+        return task, objs, None
+    return task, extract_source(name, source), content_hash
+
+
+def extract_source(name, source):
+    if _profile is None:
+        return extract_from_source(name, source, _dispatcher)
+    start = time.perf_counter()
+    objs = extract_from_source(name, source, _dispatcher, profile=_profile)
+    _profile.add_page(name, time.perf_counter() - start)
+    return objs
+
+
+def write_part(task, objs, content_hash):
+    for obj in objs:
+        _part.write(reformat(obj))
+    # the parent still needs the objects which it is going to cache
+    return task, len(objs), objs if content_hash else None, content_hash
+
+
+def extract_batch(tasks):
+    # one message back to the parent per batch: the results of its pages and statistics
+    # to be aggregated over the whole run; a result is (task, number of entries, entries or None
+    # if they were written to the part file and are not to be cached, content hash)
+    global _task_done
+    _task_done = True
+    if _part is None:
+        results = [(task, len(objs), objs, content_hash) for task, objs, content_hash in map(extract_page, tasks)]
+    else:
+        results = [write_part(*result) for result in map(extract_page, tasks)]
+        # written out before the parent records the pages as done
+        _part.flush()
+    stats = {'unmatched': _dispatcher.pop_unmatched(), 'prefilter': _dispatcher.pop_prefiltered()}
+    if _profile:
+        stats['profile'] = _profile.pop()
+    return results, stats
+
+
+def merge_stats(total, stats):
+    for key, value in stats.items():
+        if key == 'profile':
+            total.setdefault(key, ProfileReport()).merge(value)
+        else:
+            total.setdefault(key, Counter()).update(value)
+
+
+def get_rss():
+    # resident set size in bytes
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # peak instead of current RSS (kilobytes on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def recycling_worker(worker, inqueue, outqueue, initializer=None, initargs=(), maxtasks=None, wrap_exception=False):
+    # runs the standard pool worker loop one task at a time, and exits after a task
+    # (its result already sent) once the process is above the memory ceiling;
+    # the pool then starts a fresh worker in its place
+    global _task_done
+    completed = 0
+    while maxtasks is None or completed < maxtasks:
+        _task_done = False
+        worker(inqueue, outqueue, initializer, initargs, 1, wrap_exception)
+        initializer = None
+        if not _task_done:
+            # the pool is shutting down
+            break
+        completed += 1
+        if _max_rss and get_rss() > _max_rss:
+            break
+
+
+class RecyclingPool(multiprocessing.pool.Pool):
+    # pool whose workers are replaced once their RSS exceeds the `max_rss` passed to `init_worker`
+    @staticmethod
+    def Process(ctx, *args, **kwds):
+        kwds['args'] = (kwds['target'], ) + tuple(kwds['args'])
+        kwds['target'] = recycling_worker
+        return ctx.Process(*args, **kwds)
@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import sys
+import time
+
+from wiktionary_extractor.entry import to_json_default
+from wiktionary_extractor.index import get_keys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+DEFAULT_FLUSH_INTERVAL = 1.0
+COMPRESSED_EXTENSIONS = ('.gz', '.zst')
+
+
+def reformat(obj):
+    # an output line: the entry and its lowercased lookup keys
+    return [obj, get_keys(obj)]
+
+
+def get_encoder(fast=False):
+    # orjson writes compact, non-ASCII-escaped JSON; the default keeps json.dumps output
+    if fast and orjson is not None:
+        return lambda obj: orjson.dumps(obj, default=to_json_default)
+    return lambda obj: json.dumps(obj, default=to_json_default).encode('utf-8')
+
+
+def get_resume_path(path):
+    # where a resumed run writes: a compressed output left by an interrupted run ends in an
+    # unterminated stream, after which an appended one could not be read, so the run goes
+    # to the next free out.1.gz, out.2.gz, ... instead
+    if path is None or path == '-' or not path.endswith(COMPRESSED_EXTENSIONS) or not os.path.exists(path):
+        return path
+    base, ext = os.path.splitext(path)
+    n = 1
+    while os.path.exists('{}.{}{}'.format(base, n, ext)):
+        n += 1
+    return '{}.{}{}'.format(base, n, ext)
+
+
+def open_output(path, append=False):
+    mode = 'ab' if append else 'wb'
+    if path is None or path == '-':
+        return sys.stdout.buffer
+    elif path.endswith('.gz'):
+        return gzip.open(path, mode)
+    elif path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to write ' + path)
+        return zstandard.ZstdCompressor().stream_writer(open(path, mode), closefd=True)
+    else:
+        return open(path, mode)
+
+
+class NDJSONWriter(object):
+    def __init__(self,
+                 stream,
+                 buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 encode=None,
+                 on_flush=None):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.encode = encode or get_encoder()
+        # called after buffered lines have been handed to the stream
+        self.on_flush = on_flush
+        self.buffer = []
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, obj):
+        line = self.encode(obj) + b'\n'
+        self.buffer.append(line)
+        self.buffered += len(line)
+        if self.buffered >= self.buffer_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(b''.join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+        self.stream.flush()
+        self.last_flush = time.monotonic()
+        if self.on_flush:
+            self.on_flush()
+
+    def close(self):
+        self.flush()
+        if self.stream is not sys.stdout.buffer:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()